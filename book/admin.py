@@ -5,10 +5,13 @@ from book.models import (
     Book,
     BookLike,
     BookMonthView,
+    BookMonthlyStats,
     BookView,
+    CatalogChange,
     Chapter,
     Commentary,
-    Genre
+    Genre,
+    MaintenanceCheckpoint,
 )
 
 
@@ -20,3 +23,6 @@ admin.site.register(Commentary)
 admin.site.register(BookView)
 admin.site.register(BookLike)
 admin.site.register(BookMonthView)
+admin.site.register(BookMonthlyStats)
+admin.site.register(MaintenanceCheckpoint)
+admin.site.register(CatalogChange)
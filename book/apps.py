@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BookConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "book"
+
+    def ready(self):
+        from book import signals  # noqa: F401
@@ -0,0 +1,104 @@
+from collections.abc import Iterable
+
+from django.db import IntegrityError, transaction
+
+from book.counters import increment_counters
+from book.models import Book
+
+
+MAX_BATCH_SIZE = 500
+
+
+def create_missing_links(
+        model,
+        pairs: Iterable[tuple[int, int]],
+        **fields,
+) -> list[tuple[int, int]]:
+    """
+    Inserts a ``model`` row per ``(user_id, book_id)`` pair and returns
+    the pairs actually inserted. One ``bulk_create`` normally; rows
+    written concurrently by someone else make it fall back to
+    ``get_or_create`` per pair, so nothing is counted twice.
+    """
+    pairs = list(pairs)
+
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create([
+                model(user_id=user_id, book_id=book_id, **fields)
+                for user_id, book_id in pairs
+            ])
+        return pairs
+    except IntegrityError:
+        return [
+            (user_id, book_id)
+            for user_id, book_id in pairs
+            if model.objects.get_or_create(
+                user_id=user_id, book_id=book_id, **fields
+            )[1]
+        ]
+
+
+def apply_desired_states(
+        model,
+        user,
+        states: dict[int, bool],
+        counter: str | None = None,
+) -> dict[int, str]:
+    """
+    Makes ``model`` rows linking ``user`` to each book exist or not as
+    ``states`` asks, with one ``bulk_create`` and one locked delete in
+    a single transaction. Returns ``added``, ``removed``, ``unchanged``
+    or ``not_found`` per book id; repeating a batch changes nothing.
+    """
+    with transaction.atomic():
+        found = set(
+            Book.objects.filter(pk__in=list(states)).values_list(
+                "id", flat=True
+            )
+        )
+        current = set(
+            model.objects.filter(user=user, book_id__in=found).values_list(
+                "book_id", flat=True
+            )
+        )
+
+        to_add = [
+            book_id for book_id, state in states.items()
+            if state and book_id in found and book_id not in current
+        ]
+        to_remove = [
+            book_id for book_id, state in states.items()
+            if not state and book_id in current
+        ]
+
+        added = [
+            book_id for _, book_id in create_missing_links(
+                model, [(user.id, book_id) for book_id in to_add]
+            )
+        ]
+
+        # Lock the rows first, so the deleted count below is exactly
+        # these books and a concurrent unlike is not decremented twice.
+        removed = list(
+            model.objects.select_for_update().filter(
+                user=user, book_id__in=to_remove
+            ).values_list("book_id", flat=True)
+        )
+        _, deleted = model.objects.filter(
+            user=user, book_id__in=removed
+        ).delete()
+        if not deleted.get(model._meta.label):
+            removed = []
+
+        if counter:
+            if added:
+                increment_counters(added, counter)
+            if removed:
+                increment_counters(removed, counter, -1)
+
+    statuses = dict.fromkeys(states, "unchanged")
+    statuses.update(dict.fromkeys(set(states) - found, "not_found"))
+    statuses.update(dict.fromkeys(added, "added"))
+    statuses.update(dict.fromkeys(removed, "removed"))
+    return statuses
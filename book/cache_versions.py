@@ -0,0 +1,18 @@
+from django.core.cache import cache
+
+
+def get_cache_version(key: str) -> int:
+    return cache.get(key, 0)
+
+
+def bump_cache_version(key: str) -> None:
+    """
+    Increments the version counter stored at ``key``, which cache keys
+    derived from it embed, so every such entry is invalidated at once.
+    """
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr().
+        cache.set(key, 1, timeout=None)
@@ -0,0 +1,171 @@
+import codecs
+import hashlib
+from collections import defaultdict
+from typing import BinaryIO
+
+from django.core.files.storage import Storage
+from django.db import transaction
+
+from book.models import Chapter, ChapterIndexState, ChapterTerm
+from book.text import WORD_RE, normalize
+
+
+CHUNK_SIZE = 64 * 1024
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64
+MAX_OFFSETS_PER_TERM = 20
+MAX_TERMS_PER_CHAPTER = 50000
+BULK_BATCH_SIZE = 1000
+
+
+def tokenize_stream(
+        stream: BinaryIO,
+        checksum,
+        encoding: str = "utf-8",
+) -> dict[str, list[int]]:
+    """
+    Reads ``stream`` in ``CHUNK_SIZE`` pieces and returns the character
+    offsets of each normalized term. Memory stays bounded by the chunk
+    size plus the postings, which are capped per term and per chapter.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    postings = defaultdict(list)
+    carry, carry_offset, skip_leading_word = "", 0, False
+
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        final = not chunk
+        checksum.update(chunk)
+
+        text = carry + decoder.decode(chunk, final=final)
+        base_offset = carry_offset
+        carry, carry_offset = "", base_offset + len(text)
+
+        start = 0
+        if skip_leading_word and text:
+            # The over-long word dropped at the end of the previous chunk
+            # may run on through this one, and maybe past it.
+            leading = WORD_RE.match(text)
+            start = leading.end() if leading else 0
+            skip_leading_word = not final and start == len(text)
+
+        for match in WORD_RE.finditer(text, start):
+
+            # A word touching the end of the chunk may continue in the
+            # next one, so it is carried over instead of indexed now.
+            # Words already too long to index are dropped instead.
+            if not final and match.end() == len(text):
+                if len(match.group()) <= MAX_TERM_LENGTH:
+                    carry = match.group()
+                    carry_offset = base_offset + match.start()
+                else:
+                    skip_leading_word = True
+                break
+
+            term = normalize(match.group())
+            if not MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH:
+                continue
+            if term not in postings and len(postings) >= MAX_TERMS_PER_CHAPTER:
+                continue
+
+            offsets = postings[term]
+            if len(offsets) < MAX_OFFSETS_PER_TERM:
+                offsets.append(base_offset + match.start())
+
+        if final:
+            return postings
+
+
+def index_chapter_file(chapter: Chapter, stream: BinaryIO) -> int:
+    """
+    Replaces the chapter's terms with those of ``stream``. A re-upload
+    with the same contents only records the new file name.
+    """
+    checksum = hashlib.sha256()
+    postings = tokenize_stream(stream, checksum)
+
+    with transaction.atomic():
+        unchanged = ChapterIndexState.objects.filter(
+            chapter=chapter,
+            checksum=checksum.hexdigest(),
+        ).exists()
+
+        if not unchanged:
+            ChapterTerm.objects.filter(chapter=chapter).delete()
+            ChapterTerm.objects.bulk_create(
+                (
+                    ChapterTerm(
+                        book_id=chapter.book_id,
+                        chapter=chapter,
+                        term=term,
+                        offsets=offsets,
+                    )
+                    for term, offsets in postings.items()
+                ),
+                batch_size=BULK_BATCH_SIZE,
+            )
+        ChapterIndexState.objects.update_or_create(
+            chapter=chapter,
+            defaults={
+                "file_name": chapter.file.name,
+                "checksum": checksum.hexdigest(),
+            },
+        )
+
+    return len(postings)
+
+
+def index_chapter(chapter_id: int, storage: Storage | None = None) -> int:
+    """
+    Indexes the chapter's file unless the stored file name matches the
+    last indexed one (uploads always get a fresh name). ``storage``
+    defaults to the field's storage and can be swapped for a local
+    FileSystemStorage.
+    """
+    chapter = Chapter.objects.select_related("index_state").filter(
+        pk=chapter_id
+    ).first()
+
+    if chapter is None or not chapter.file:
+        return 0
+
+    state = getattr(chapter, "index_state", None)
+    if state and state.file_name == chapter.file.name:
+        return 0
+
+    storage = storage or chapter.file.storage
+    with storage.open(chapter.file.name, "rb") as stream:
+        return index_chapter_file(chapter, stream)
+
+
+def search_book_text(
+        book_id: int,
+        query: str,
+        limit: int,
+) -> list[dict]:
+    terms = {
+        term for term in (normalize(word) for word in WORD_RE.findall(query))
+        if MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH
+    }
+
+    if not terms:
+        return []
+
+    matches = defaultdict(dict)
+    for chapter_id, serial_number, term, offsets in ChapterTerm.objects.filter(
+        book=book_id,
+        term__in=terms,
+    ).values_list("chapter_id", "chapter__serial_number", "term", "offsets"):
+        matches[(serial_number, chapter_id)][term] = offsets
+
+    return [
+        {
+            "chapter_id": chapter_id,
+            "serial_number": serial_number,
+            "offsets": terms_offsets,
+        }
+        for (serial_number, chapter_id), terms_offsets in sorted(
+            matches.items()
+        )
+        if terms_offsets.keys() == terms
+    ][:limit]
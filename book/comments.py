@@ -0,0 +1,21 @@
+from django.db.models import QuerySet
+from django.db.models.functions import Coalesce
+
+from book.counters import count_subquery
+from book.models import Commentary
+
+
+def comments_count() -> Coalesce:
+    return count_subquery(Commentary.objects.all(), "book")
+
+
+def book_comments(book_id: int) -> QuerySet:
+    return Commentary.objects.filter(
+        book=book_id
+    ).annotate(
+        replies_count=count_subquery(Commentary.objects.all(), "parent")
+    )
+
+
+def comment_replies(parent_id: int) -> QuerySet:
+    return Commentary.objects.filter(parent=parent_id)
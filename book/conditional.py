@@ -0,0 +1,97 @@
+import hashlib
+from collections.abc import Iterable
+
+from django.db.models import Count, Max, QuerySet
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from book.models import Book
+
+
+def touch_books(book_ids: Iterable[int]) -> int:
+    book_ids = [book_id for book_id in book_ids if book_id]
+
+    if not book_ids:
+        return 0
+
+    return Book.objects.filter(pk__in=book_ids).update(
+        updated_at=timezone.now()
+    )
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(
+        "|".join(map(str, parts)).encode(),
+        digest_size=16,
+    ).hexdigest()
+    return f'W/{quote_etag(digest)}'
+
+
+def representation_key(request) -> tuple:
+    # Query parameters (cursor, fields, ...) and the negotiated renderer
+    # both change the body, so they are part of every ETag.
+    return (
+        request.accepted_renderer.format,
+        request.get_full_path(),
+    )
+
+
+def check_not_modified(request, etag: str, last_modified=None):
+    """
+    Returns a 304 (or 412) response when the request's conditional
+    headers match, otherwise None.
+    """
+    return get_conditional_response(
+        request._request,
+        etag=etag,
+        last_modified=(
+            int(last_modified.timestamp()) if last_modified else None
+        ),
+    )
+
+
+def set_validators(response, etag: str, last_modified=None):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def collection_validators(
+        queryset: QuerySet,
+        request,
+) -> tuple[str, object]:
+    """
+    ETag and Last-Modified for a whole collection from one aggregate:
+    the newest ``updated_at`` catches edits and additions, the row count
+    catches deletions.
+    """
+    state = queryset.order_by().aggregate(
+        last_modified=Max("updated_at"),
+        total=Count("pk"),
+    )
+    etag = make_etag(
+        state["last_modified"],
+        state["total"],
+        *representation_key(request),
+    )
+    return etag, state["last_modified"]
+
+
+class ConditionalListMixin:
+    """
+    Answers ``list`` with 304 Not Modified, before any page is fetched or
+    serialized, when the collection has not changed.
+    """
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = collection_validators(
+            self.get_queryset(), request
+        )
+        response = check_not_modified(request, etag, last_modified)
+
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+
+        return set_validators(response, etag, last_modified)
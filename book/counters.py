@@ -0,0 +1,95 @@
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    QuerySet,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+
+from book.models import (
+    Book,
+    BookLike,
+    BookMonthView,
+    BookView,
+    current_month,
+)
+
+
+COUNTER_SOURCES = {
+    "views_count": BookView,
+    "likes_count": BookLike,
+    "month_views_count": BookMonthView,
+}
+
+
+def increment_counter(book_id: int, field: str, delta: int = 1) -> None:
+    increment_counters([book_id], field, delta)
+
+
+def increment_counters(
+        book_ids: Iterable[int],
+        field: str,
+        delta: int = 1,
+) -> int:
+    return Book.objects.filter(pk__in=list(book_ids)).update(
+        **{field: F(field) + delta}
+    )
+
+
+def current_month_views() -> QuerySet:
+    # Earlier months' rows stay until clear_month_views has rolled them
+    # up and deleted them.
+    return BookMonthView.objects.filter(month=current_month())
+
+
+def count_subquery(queryset: QuerySet, field: str = "book") -> Coalesce:
+    """
+    Number of ``queryset`` rows whose ``field`` points at the outer row.
+    """
+    counts = queryset.filter(
+        **{field: OuterRef("pk")}
+    ).order_by().values(field).annotate(
+        total=Count("pk")
+    ).values("total")
+
+    return Coalesce(
+        Subquery(counts, output_field=IntegerField()),
+        0,
+    )
+
+
+def get_counter_sources() -> dict[str, QuerySet]:
+    tracking = getattr(settings, "BOOK_VIEW_TRACKING", {})
+    sources = {
+        field: model.objects.all()
+        for field, model in COUNTER_SOURCES.items()
+    }
+    sources["month_views_count"] = current_month_views()
+
+    if tracking.get("counting") == "sketch":
+        del sources["views_count"]
+    return sources
+
+
+def recount_counters(book_ids: Iterable[int] | None = None) -> int:
+    queryset = Book.objects.all()
+
+    if book_ids is not None:
+        queryset = queryset.filter(pk__in=list(book_ids))
+
+    return queryset.update(**{
+        field: count_subquery(source)
+        for field, source in get_counter_sources().items()
+    })
+
+
+def reset_month_counter() -> int:
+    # Views of the new month recorded before the reset stay counted.
+    return Book.objects.filter(
+        month_views_count__gt=0
+    ).update(month_views_count=count_subquery(current_month_views()))
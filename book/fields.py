@@ -0,0 +1,101 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+FIELDS_QUERY_PARAM = "fields"
+EXPAND_QUERY_PARAM = "expand"
+
+
+def parse_field_list(value: str | None) -> set[str] | None:
+    """
+    Names in a comma-separated parameter. A missing or empty parameter
+    (``?fields=``) gives ``None``, i.e. the default selection.
+    """
+    if value is None:
+        return None
+
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    return names or None
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Lets the view choose which top-level fields are rendered through the
+    ``fields`` context key. Names in ``expandable_fields`` are left out
+    unless asked for with ``?expand=``.
+    """
+
+    expandable_fields = ()
+
+    @classmethod
+    def select_fields(
+            cls,
+            fields: set[str] | None,
+            expand: set[str] | None,
+    ) -> set[str]:
+        available = set(cls.Meta.fields)
+        errors = {}
+
+        if fields is not None and fields - available:
+            errors[FIELDS_QUERY_PARAM] = (
+                "Unknown fields: " + ", ".join(sorted(fields - available))
+            )
+        if expand is not None and expand - set(cls.expandable_fields):
+            errors[EXPAND_QUERY_PARAM] = (
+                "Not expandable: "
+                + ", ".join(sorted(expand - set(cls.expandable_fields)))
+            )
+        if errors:
+            raise ValidationError(errors)
+
+        if fields is None:
+            fields = available - set(cls.expandable_fields)
+
+        return fields | (expand or set())
+
+    def _is_root(self) -> bool:
+        return self.parent is None or (
+            isinstance(self.parent, serializers.ListSerializer)
+            and self.parent.parent is None
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get("fields")
+
+        if selected is None or not self._is_root():
+            return fields
+
+        return {
+            name: field for name, field in fields.items() if name in selected
+        }
+
+
+class SparseFieldsViewMixin:
+    """
+    Parses ``?fields=``/``?expand=`` against the serializer of the current
+    action so ``get_queryset`` can skip the joins, prefetches and
+    annotations of fields that will not be rendered (see
+    ``book.planner.QueryPlanMixin``).
+    """
+
+    def get_field_selection(self) -> set[str] | None:
+        if not hasattr(self, "_field_selection"):
+            serializer_class = self.get_serializer_class()
+            params = self.request.query_params
+            fields = parse_field_list(params.get(FIELDS_QUERY_PARAM))
+            expand = parse_field_list(params.get(EXPAND_QUERY_PARAM))
+
+            if hasattr(serializer_class, "select_fields"):
+                self._field_selection = serializer_class.select_fields(
+                    fields, expand
+                )
+            else:
+                self._field_selection = None
+
+        return self._field_selection
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_field_selection()
+        return context
@@ -0,0 +1,65 @@
+import hashlib
+import math
+
+import numpy as np
+
+
+HLL_PRECISION = 12
+HLL_REGISTERS = 1 << HLL_PRECISION
+
+# Relative standard error of a count estimate, 1.04 / sqrt(registers):
+# about 1.6% with 4096 one-byte registers (4 KiB per sketch).
+HLL_STANDARD_ERROR = 1.04 / math.sqrt(HLL_REGISTERS)
+
+_HASH_BITS = 64
+_RANK_BITS = _HASH_BITS - HLL_PRECISION
+_ALPHA = 0.7213 / (1 + 1.079 / HLL_REGISTERS)
+
+
+def _hash(value) -> int:
+    digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+
+    def __init__(self, registers: bytes | None = None):
+        if registers is None:
+            self.registers = bytearray(HLL_REGISTERS)
+        elif len(registers) == HLL_REGISTERS:
+            self.registers = bytearray(registers)
+        else:
+            raise ValueError(
+                f"Expected {HLL_REGISTERS} registers, got {len(registers)}"
+            )
+
+    def add(self, value) -> bool:
+        hashed = _hash(value)
+        index = hashed >> _RANK_BITS
+        remainder = hashed & ((1 << _RANK_BITS) - 1)
+        rank = _RANK_BITS - remainder.bit_length() + 1
+
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def count(self) -> int:
+        registers = np.frombuffer(self.registers, dtype=np.uint8)
+        estimate = (
+            _ALPHA * HLL_REGISTERS ** 2
+            / np.sum(np.exp2(-registers.astype(np.float64)))
+        )
+
+        zeros = HLL_REGISTERS - np.count_nonzero(registers)
+        if estimate <= 2.5 * HLL_REGISTERS and zeros:
+            estimate = HLL_REGISTERS * math.log(HLL_REGISTERS / zeros)
+
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, registers: bytes) -> "HyperLogLog":
+        return cls(registers)
@@ -0,0 +1,146 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.conf import settings
+from django_q.brokers.redis_broker import Redis as RedisBroker
+
+from book.models import Book
+
+
+class DatabaseLeaderboard:
+    """
+    Reads the ranking straight from the indexed ``Book.month_views_count``
+    column, which the view tracking keeps up to date.
+    """
+
+    def add_view(self, book_id: int) -> None:
+        pass
+
+    def sync(self, book_ids: Iterable[int]) -> None:
+        pass
+
+    def top(self, limit: int, genre_id: int | None = None) -> list[int]:
+        queryset = Book.objects.filter(month_views_count__gt=0)
+
+        if genre_id:
+            queryset = queryset.filter(genres__id=genre_id)
+
+        return list(
+            queryset.order_by(
+                "-month_views_count", "-id"
+            ).values_list("id", flat=True)[:limit]
+        )
+
+    def rotate(self) -> None:
+        pass
+
+    def rebuild(self) -> None:
+        pass
+
+
+class RedisLeaderboard:
+    """
+    Keeps one sorted set per month for all books plus one per genre.
+    Keys carry a period number, so the monthly reset only bumps the
+    period and unlinks the previous month's keys.
+    """
+
+    prefix = "booklink:leaderboard"
+
+    def __init__(self):
+        self.connection = RedisBroker.get_connection()
+
+    @property
+    def period_key(self) -> str:
+        return f"{self.prefix}:period"
+
+    def _period(self) -> int:
+        return int(self.connection.get(self.period_key) or 0)
+
+    def _key(self, period: int, genre_id: int | None = None) -> str:
+        if genre_id:
+            return f"{self.prefix}:{period}:genre:{genre_id}"
+        return f"{self.prefix}:{period}:all"
+
+    def add_view(self, book_id: int) -> None:
+        period = self._period()
+        pipeline = self.connection.pipeline()
+
+        pipeline.zincrby(self._key(period), 1, book_id)
+        for genre_id in Book.genres.through.objects.filter(
+            book_id=book_id
+        ).values_list("genre_id", flat=True):
+            pipeline.zincrby(self._key(period, genre_id), 1, book_id)
+
+        pipeline.execute()
+
+    def sync(self, book_ids: Iterable[int]) -> None:
+        books = Book.objects.filter(
+            pk__in=list(book_ids),
+            month_views_count__gt=0,
+        ).prefetch_related("genres")
+        self._write_scores(books, self._period())
+
+    def _write_scores(self, books: Iterable[Book], period: int) -> None:
+        scores = defaultdict(dict)
+
+        for book in books:
+            scores[self._key(period)][book.id] = book.month_views_count
+            for genre in book.genres.all():
+                scores[self._key(period, genre.id)][book.id] = (
+                    book.month_views_count
+                )
+
+        if not scores:
+            return
+
+        pipeline = self.connection.pipeline()
+        for key, mapping in scores.items():
+            pipeline.zadd(key, mapping)
+        pipeline.execute()
+
+    def top(self, limit: int, genre_id: int | None = None) -> list[int]:
+        book_ids = self.connection.zrevrange(
+            self._key(self._period(), genre_id), 0, limit - 1
+        )
+        return [int(book_id) for book_id in book_ids]
+
+    def _unlink_period(self, period: int) -> None:
+        stale_keys = list(
+            self.connection.scan_iter(match=f"{self.prefix}:{period}:*")
+        )
+
+        if stale_keys:
+            self.connection.unlink(*stale_keys)
+
+    def rotate(self) -> None:
+        self._unlink_period(self.connection.incr(self.period_key) - 1)
+
+    def rebuild(self) -> None:
+        period = self._period()
+        self._write_scores(
+            Book.objects.filter(
+                month_views_count__gt=0
+            ).prefetch_related("genres").iterator(chunk_size=2000),
+            period + 1,
+        )
+        self.connection.set(self.period_key, period + 1)
+        self._unlink_period(period)
+
+
+LEADERBOARD_BACKENDS = {
+    "database": DatabaseLeaderboard,
+    "redis": RedisLeaderboard,
+}
+
+_leaderboard = None
+
+
+def get_leaderboard() -> DatabaseLeaderboard | RedisLeaderboard:
+    global _leaderboard
+
+    if _leaderboard is None:
+        backend = getattr(settings, "BOOK_LEADERBOARD_BACKEND", "database")
+        _leaderboard = LEADERBOARD_BACKENDS[backend]()
+
+    return _leaderboard
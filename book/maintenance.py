@@ -0,0 +1,124 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, QuerySet
+from django_q.tasks import async_task
+
+from book.models import MaintenanceCheckpoint
+
+
+def get_maintenance_settings() -> dict:
+    return {
+        "batch_size": 5000,
+        "sleep": 0.1,
+        "cluster": "long",
+        **getattr(settings, "BOOK_MAINTENANCE", {}),
+    }
+
+
+class BatchedJob:
+    """
+    Walks ``get_queryset()`` in primary key ranges of ``batch_size`` rows,
+    committing and checkpointing after every range so a job that is
+    interrupted resumes where it stopped. Rows created after the job
+    started are left alone.
+    """
+
+    name: str
+
+    def __init__(
+            self,
+            batch_size: int | None = None,
+            sleep: float | None = None,
+    ):
+        config = get_maintenance_settings()
+        self.batch_size = batch_size or config["batch_size"]
+        self.sleep = config["sleep"] if sleep is None else sleep
+
+    def get_queryset(self) -> QuerySet:
+        raise NotImplementedError
+
+    def process_batch(self, queryset: QuerySet) -> int:
+        raise NotImplementedError
+
+    def on_start(self, checkpoint: MaintenanceCheckpoint) -> None:
+        pass
+
+    def _get_checkpoint(self) -> MaintenanceCheckpoint:
+        checkpoint, created = MaintenanceCheckpoint.objects.get_or_create(
+            job=self.name
+        )
+
+        if created or checkpoint.max_pk is None:
+            with transaction.atomic():
+                checkpoint.max_pk = self.get_queryset().aggregate(
+                    max_pk=Max("pk")
+                )["max_pk"] or 0
+                self.on_start(checkpoint)
+                checkpoint.save(update_fields=["max_pk", "updated_at"])
+
+        return checkpoint
+
+    def _get_upper_pk(self, checkpoint: MaintenanceCheckpoint) -> int | None:
+        remaining = self.get_queryset().filter(
+            pk__gt=checkpoint.last_pk,
+            pk__lte=checkpoint.max_pk,
+        ).order_by("pk").values_list("pk", flat=True)
+
+        upper_pk = remaining[self.batch_size - 1:self.batch_size].first()
+
+        if upper_pk is None and remaining.exists():
+            return checkpoint.max_pk
+        return upper_pk
+
+    def run(self) -> int:
+        checkpoint = self._get_checkpoint()
+        processed = 0
+
+        while (upper_pk := self._get_upper_pk(checkpoint)) is not None:
+            with transaction.atomic():
+                processed += self.process_batch(
+                    self.get_queryset().filter(
+                        pk__gt=checkpoint.last_pk,
+                        pk__lte=upper_pk,
+                    )
+                )
+                checkpoint.last_pk = upper_pk
+                checkpoint.save(update_fields=["last_pk", "updated_at"])
+
+            if self.sleep:
+                time.sleep(self.sleep)
+
+        checkpoint.delete()
+        return processed
+
+
+class BatchedDeleteJob(BatchedJob):
+    model: type
+
+    def get_queryset(self) -> QuerySet:
+        return self.model.objects.all()
+
+    def process_batch(self, queryset: QuerySet) -> int:
+        deleted, _ = queryset.delete()
+        return deleted
+
+
+class BatchedUpdateJob(BatchedJob):
+    model: type
+    values: dict
+
+    def get_queryset(self) -> QuerySet:
+        return self.model.objects.all()
+
+    def process_batch(self, queryset: QuerySet) -> int:
+        return queryset.update(**self.values)
+
+
+def enqueue_job(func: str, *args) -> str:
+    return async_task(
+        func,
+        *args,
+        cluster=get_maintenance_settings()["cluster"],
+    )
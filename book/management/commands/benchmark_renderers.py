@@ -0,0 +1,75 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from booklink_service import renderers
+
+
+def build_payload(count: int) -> dict:
+    return {
+        "next": "http://testserver/api/book/books/?cursor=eyJvIjoiaWQifQ==",
+        "previous": None,
+        "results": [
+            {
+                "id": index,
+                "image": f"https://bucket.s3.amazonaws.com/books/{index}.png",
+                "name": f"Book number {index}",
+                "genres": ["Fantasy", "Adventure"],
+                "authors": [
+                    {"first_name": "Ann", "last_name": "Lee"},
+                    {"first_name": "Bob", "last_name": "Ray"},
+                ],
+                "pages": 300 + index,
+                "summary": "A long summary about dragons. " * 10,
+                "is_liked": bool(index % 2),
+                "in_library": bool(index % 3),
+                "viewed": bool(index % 5),
+            }
+            for index in range(count)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the stdlib JSON renderer with the orjson and MessagePack "
+        "renderers on a book list payload"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options):
+        payload = build_payload(options["count"])
+        candidates = {"json (stdlib)": JSONRenderer()}
+
+        if renderers.orjson is not None:
+            candidates["json (orjson)"] = renderers.ORJSONRenderer()
+        if renderers.msgpack is not None:
+            candidates["msgpack"] = renderers.MessagePackRenderer()
+
+        baseline = None
+        for name, renderer in candidates.items():
+            size = len(renderer.render(payload))
+            seconds = timeit.timeit(
+                lambda: renderer.render(payload),
+                number=options["repeat"],
+            ) / options["repeat"]
+            baseline = baseline or seconds
+
+            self.stdout.write(
+                f"{name:<15} {seconds * 1000:8.3f} ms  "
+                f"{size:>9} bytes  {baseline / seconds:5.1f}x"
+            )
+
+        missing = [
+            module
+            for module in ("orjson", "msgpack")
+            if getattr(renderers, module) is None
+        ]
+        if missing:
+            self.stdout.write(
+                self.style.WARNING(f"Not installed: {', '.join(missing)}")
+            )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from book.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the book full-text search index from scratch"
+
+    def handle(self, *args, **options):
+        get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt"))
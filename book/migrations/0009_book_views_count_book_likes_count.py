@@ -0,0 +1,45 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:15
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Book = apps.get_model("book", "Book")
+    BookView = apps.get_model("book", "BookView")
+    BookLike = apps.get_model("book", "BookLike")
+
+    def count_of(model):
+        counts = model.objects.filter(
+            book=OuterRef("pk")
+        ).order_by().values("book").annotate(
+            total=Count("pk")
+        ).values("total")
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    Book.objects.update(
+        views_count=count_of(BookView),
+        likes_count=count_of(BookLike),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0008_author_picture"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="views_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
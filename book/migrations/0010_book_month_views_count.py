@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:17
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_month_views_count(apps, schema_editor):
+    Book = apps.get_model("book", "Book")
+    BookMonthView = apps.get_model("book", "BookMonthView")
+
+    counts = BookMonthView.objects.filter(
+        book=OuterRef("pk")
+    ).order_by().values("book").annotate(
+        total=Count("pk")
+    ).values("total")
+
+    Book.objects.update(
+        month_views_count=Coalesce(
+            Subquery(counts, output_field=IntegerField()), 0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0009_book_views_count_book_likes_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="month_views_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["month_views_count", "id"], name="book_month_views_idx"
+            ),
+        ),
+        migrations.RunPython(
+            fill_month_views_count, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0010_book_month_views_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MaintenanceCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("job", models.CharField(max_length=64, unique=True)),
+                ("last_pk", models.BigIntegerField(default=0)),
+                ("max_pk", models.BigIntegerField(null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
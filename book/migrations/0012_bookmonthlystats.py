@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0011_maintenancecheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookMonthlyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year_month", models.DateField()),
+                ("views", models.PositiveIntegerField()),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_stats",
+                        to="book.book",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "book monthly stats",
+                "ordering": ["-year_month"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("book", "year_month"),
+                        name="one_stats_row_for_book_per_month",
+                    )
+                ],
+            },
+        ),
+    ]
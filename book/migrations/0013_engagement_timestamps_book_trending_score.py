@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:19
+
+import datetime
+
+from django.db import migrations, models
+
+# Rows created before the timestamps existed get the epoch, which keeps
+# them out of every trending window instead of making them look new.
+LEGACY_CREATED_AT = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0012_bookmonthlystats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="trending_score",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="booklike",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, db_index=True, default=LEGACY_CREATED_AT
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="bookview",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, db_index=True, default=LEGACY_CREATED_AT
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["trending_score", "id"], name="book_trending_idx"
+            ),
+        ),
+    ]
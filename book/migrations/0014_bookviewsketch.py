@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0013_engagement_timestamps_book_trending_score"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookViewSketch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("period", models.CharField(max_length=7)),
+                ("registers", models.BinaryField()),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="view_sketches",
+                        to="book.book",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("book", "period"),
+                        name="one_view_sketch_for_book_per_period",
+                    )
+                ],
+            },
+        ),
+    ]
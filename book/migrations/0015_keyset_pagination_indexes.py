@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0014_bookviewsketch"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["name", "id"], name="book_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["likes_count", "id"], name="book_likes_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["views_count", "id"], name="book_views_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="genre",
+            index=models.Index(fields=["name", "id"], name="genre_name_idx"),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0015_keyset_pagination_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="commentary",
+            index=models.Index(
+                fields=["book", "date", "id"], name="commentary_book_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="commentary",
+            index=models.Index(
+                fields=["parent", "date", "id"], name="commentary_parent_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:24
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def renumber_duplicate_chapters(apps, schema_editor):
+    # Chapters sharing a serial number within a book are pushed up just
+    # enough to be unique, keeping the (serial_number, id) reading order.
+    Chapter = apps.get_model("book", "Chapter")
+
+    book_ids = (
+        Chapter.objects.values("book_id", "serial_number")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .values_list("book_id", flat=True)
+        .distinct()
+    )
+
+    for book_id in list(book_ids):
+        previous = None
+        changed = []
+        for chapter in Chapter.objects.filter(book_id=book_id).order_by(
+            "serial_number", "id"
+        ):
+            if previous is not None and chapter.serial_number <= previous:
+                chapter.serial_number = previous + 1
+                changed.append(chapter)
+            previous = chapter.serial_number
+        Chapter.objects.bulk_update(changed, ["serial_number"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0016_commentary_thread_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(renumber_duplicate_chapters, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="chapter",
+            constraint=models.UniqueConstraint(
+                fields=("book", "serial_number"),
+                name="one_chapter_for_serial_number_in_book",
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:40
+
+from django.db import migrations
+
+
+CREATE_SEARCH_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS book_search USING fts5(
+        name,
+        summary,
+        authors,
+        genres,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+"""
+
+FILL_SEARCH_TABLE = """
+    INSERT INTO book_search (rowid, name, summary, authors, genres)
+    SELECT
+        book.id,
+        book.name,
+        book.summary,
+        (
+            SELECT group_concat(
+                author.first_name || ' ' || author.last_name, ' '
+            )
+            FROM book_book_authors AS book_author
+            JOIN book_author AS author ON author.id = book_author.author_id
+            WHERE book_author.book_id = book.id
+        ),
+        (
+            SELECT group_concat(genre.name, ' ')
+            FROM book_book_genres AS book_genre
+            JOIN book_genre AS genre ON genre.id = book_genre.genre_id
+            WHERE book_genre.book_id = book.id
+        )
+    FROM book_book AS book
+"""
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute(CREATE_SEARCH_TABLE)
+    schema_editor.execute(FILL_SEARCH_TABLE)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute("DROP TABLE IF EXISTS book_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0017_chapter_unique_serial_number"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0018_book_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChapterIndexState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("file_name", models.CharField(max_length=256)),
+                ("checksum", models.CharField(max_length=64)),
+                ("indexed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "chapter",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="index_state",
+                        to="book.chapter",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ChapterTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                ("offsets", models.JSONField(default=list)),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chapter_terms",
+                        to="book.book",
+                    ),
+                ),
+                (
+                    "chapter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="book.chapter",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["book", "term"], name="chapter_term_book_term_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("chapter", "term"), name="one_term_row_for_chapter"
+                    )
+                ],
+            },
+        ),
+    ]
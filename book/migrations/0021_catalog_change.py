@@ -0,0 +1,63 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:43
+
+from django.db import migrations, models
+
+
+def seed_change_log(apps, schema_editor):
+    # Existing rows become upserts so a client syncing from cursor 0 gets
+    # the whole catalog.
+    CatalogChange = apps.get_model("book", "CatalogChange")
+
+    for model_name in ("genre", "author", "book", "chapter"):
+        model = apps.get_model("book", model_name)
+        object_ids = model.objects.order_by("pk").values_list("pk", flat=True)
+        CatalogChange.objects.bulk_create(
+            (
+                CatalogChange(model=model_name, object_id=object_id, action="upsert")
+                for object_id in object_ids.iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0020_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=16)),
+                ("object_id", models.BigIntegerField()),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("upsert", "Upsert"), ("delete", "Delete")],
+                        max_length=6,
+                    ),
+                ),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["model", "object_id", "id"],
+                        name="catalog_change_object_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(seed_change_log, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:04
+
+import book.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0021_catalog_change"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="bookmonthview",
+            name="one_view_for_user_for_book_this_month",
+        ),
+        migrations.AddField(
+            model_name="bookmonthview",
+            name="month",
+            field=models.DateField(default=book.models.current_month),
+        ),
+        migrations.AddConstraint(
+            model_name="bookmonthview",
+            constraint=models.UniqueConstraint(
+                fields=("book", "month", "user"),
+                name="one_view_for_user_for_book_per_month",
+            ),
+        ),
+    ]
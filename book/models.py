@@ -4,12 +4,17 @@ import uuid
 from django.db import models
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.text import slugify
 
 from storages.backends.s3boto3 import S3Boto3Storage
 from storages.backends.s3 import S3File
 
 
+def current_month():
+    return timezone.localdate().replace(day=1)
+
+
 def get_sentinel_user():
     return get_user_model().objects.get_or_create(
         first_name="User", last_name="Deleted", email=None
@@ -18,6 +23,12 @@ def get_sentinel_user():
 
 class Genre(models.Model):
     name = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["name", "id"], name="genre_name_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -44,6 +55,7 @@ class Author(models.Model):
     )
     first_name = models.CharField(max_length=64)
     last_name = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.first_name + " " + self.last_name
@@ -75,6 +87,35 @@ class Book(models.Model):
     authors = models.ManyToManyField(Author, related_name="books")
     pages = models.IntegerField()
     summary = models.TextField()
+    views_count = models.PositiveIntegerField(default=0, editable=False)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    month_views_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    trending_score = models.FloatField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["name", "id"], name="book_name_idx"),
+            models.Index(
+                fields=["likes_count", "id"],
+                name="book_likes_idx",
+            ),
+            models.Index(
+                fields=["views_count", "id"],
+                name="book_views_idx",
+            ),
+            models.Index(
+                fields=["month_views_count", "id"],
+                name="book_month_views_idx",
+            ),
+            models.Index(
+                fields=["trending_score", "id"],
+                name="book_trending_idx",
+            ),
+        ]
 
     def __str__(self):
         return "Book: " + self.name
@@ -104,6 +145,15 @@ class Chapter(models.Model):
         storage=BookRelatedS3Storage,
         upload_to=get_chapter_s3_path,
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("book", "serial_number"),
+                name="one_chapter_for_serial_number_in_book"
+            ),
+        ]
 
     def __str__(self):
         return "Chapter: " + self.name
@@ -113,6 +163,52 @@ class Chapter(models.Model):
         return storage.open(self.file.name, "rb")
 
 
+class ChapterTerm(models.Model):
+    book = models.ForeignKey(
+        Book,
+        on_delete=models.CASCADE,
+        related_name="chapter_terms"
+    )
+    chapter = models.ForeignKey(
+        Chapter,
+        on_delete=models.CASCADE,
+        related_name="terms"
+    )
+    term = models.CharField(max_length=64)
+    offsets = models.JSONField(default=list)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["book", "term"],
+                name="chapter_term_book_term_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=("chapter", "term"),
+                name="one_term_row_for_chapter"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.term} in {self.chapter}"
+
+
+class ChapterIndexState(models.Model):
+    chapter = models.OneToOneField(
+        Chapter,
+        on_delete=models.CASCADE,
+        related_name="index_state"
+    )
+    file_name = models.CharField(max_length=256)
+    checksum = models.CharField(max_length=64)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.chapter} indexed at {self.indexed_at}"
+
+
 class Commentary(models.Model):
     book = models.ForeignKey(
         Book,
@@ -135,9 +231,20 @@ class Commentary(models.Model):
         on_delete=models.CASCADE,
         related_name="replies"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-date"]
+        indexes = [
+            models.Index(
+                fields=["book", "date", "id"],
+                name="commentary_book_date_idx",
+            ),
+            models.Index(
+                fields=["parent", "date", "id"],
+                name="commentary_parent_date_idx",
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 condition=models.Q(book__isnull=False)
@@ -162,6 +269,7 @@ class BookView(models.Model):
         on_delete=models.CASCADE,
         related_name="viewed_by"
     )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         constraints = [
@@ -183,6 +291,7 @@ class BookLike(models.Model):
         on_delete=models.CASCADE,
         related_name="liked_by"
     )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         constraints = [
@@ -204,11 +313,97 @@ class BookMonthView(models.Model):
         on_delete=models.CASCADE,
         related_name="viewed_by_this_month"
     )
+    month = models.DateField(default=current_month)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(
-                fields=("book", "user"),
-                name="one_view_for_user_for_book_this_month"
+                fields=("book", "month", "user"),
+                name="one_view_for_user_for_book_per_month"
+            ),
+        ]
+
+
+class BookMonthlyStats(models.Model):
+    book = models.ForeignKey(
+        Book,
+        on_delete=models.CASCADE,
+        related_name="monthly_stats"
+    )
+    year_month = models.DateField()
+    views = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["-year_month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=("book", "year_month"),
+                name="one_stats_row_for_book_per_month"
+            ),
+        ]
+        verbose_name_plural = "book monthly stats"
+
+    def __str__(self):
+        return f"{self.book} {self.year_month:%Y-%m}: {self.views}"
+
+
+class BookViewSketch(models.Model):
+    ALL_TIME = "all"
+
+    book = models.ForeignKey(
+        Book,
+        on_delete=models.CASCADE,
+        related_name="view_sketches"
+    )
+    period = models.CharField(max_length=7)
+    registers = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("book", "period"),
+                name="one_view_sketch_for_book_per_period"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.book} viewers sketch ({self.period})"
+
+
+class MaintenanceCheckpoint(models.Model):
+    job = models.CharField(max_length=64, unique=True)
+    last_pk = models.BigIntegerField(default=0)
+    max_pk = models.BigIntegerField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.job} at {self.last_pk}/{self.max_pk}"
+
+
+class CatalogChange(models.Model):
+    """
+    Append-only log of catalog writes read by the sync endpoint. The
+    auto-incrementing id is the client's cursor.
+    """
+    UPSERT = "upsert"
+    DELETE = "delete"
+    ACTION_CHOICES = (
+        (UPSERT, "Upsert"),
+        (DELETE, "Delete"),
+    )
+
+    model = models.CharField(max_length=16)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["model", "object_id", "id"],
+                name="catalog_change_object_idx",
             ),
         ]
+
+    def __str__(self):
+        return f"{self.action} {self.model} {self.object_id} ({self.id})"
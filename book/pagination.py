@@ -0,0 +1,204 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from book.params import get_limit_param
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder drops microseconds past the millisecond, which
+    # would make a cursor skip rows sharing the truncated timestamp.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a whitelist of orderings declared on the view
+    as ``cursor_orderings = {"name": "name", ...}``, mapping the value of
+    the ``order`` query parameter (optionally prefixed with ``-``) to a
+    model field. Every ordering is made unique with ``id`` as tiebreaker,
+    and pages are fetched with ``(field, id) > (value, id)`` comparisons,
+    so each page costs one index range scan however deep the client is.
+    """
+
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    ordering_query_param = "order"
+    tiebreaker = "id"
+
+    def get_page_size(self, request) -> int:
+        return get_limit_param(
+            request,
+            self.page_size_query_param,
+            self.page_size,
+            self.max_page_size,
+        )
+
+    def get_ordering(self, request, view) -> tuple[str, str]:
+        orderings = view.cursor_orderings
+        order = request.query_params.get(
+            self.ordering_query_param,
+            getattr(view, "default_cursor_ordering", self.tiebreaker),
+        )
+        name = order.removeprefix("-")
+
+        if name not in orderings:
+            raise ValidationError({
+                self.ordering_query_param: (
+                    "Unsupported ordering. Choose one of: "
+                    + ", ".join(sorted(orderings))
+                )
+            })
+
+        return order, orderings[name]
+
+    def encode_cursor(self, payload: dict) -> str:
+        data = json.dumps(payload, cls=CursorEncoder).encode()
+        return base64.urlsafe_b64encode(data).decode()
+
+    def decode_cursor(self, request) -> dict | None:
+        cursor = request.query_params.get(self.cursor_query_param)
+
+        if not cursor:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError, UnicodeError):
+            payload = None
+
+        if not (
+            isinstance(payload, dict)
+            and payload.keys() == {"o", "v", "i", "r"}
+            and payload["o"] == self.order
+        ):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+
+        return payload
+
+    def _seek(self, field: str, value, pk, descending: bool) -> Q:
+        lookup = "lt" if descending else "gt"
+
+        if field == self.tiebreaker:
+            return Q(**{f"{field}__{lookup}": value})
+
+        return Q(**{f"{field}__{lookup}": value}) | Q(
+            **{field: value, f"{self.tiebreaker}__{lookup}": pk}
+        )
+
+    def paginate(
+            self,
+            queryset: QuerySet,
+            order: str,
+            field: str,
+            cursor: dict | None = None,
+    ) -> list:
+        self.order, self.field = order, field
+        self.reverse = bool(cursor and cursor["r"])
+
+        # Walking backwards is a forward walk in the opposite direction.
+        descending = order.startswith("-") ^ self.reverse
+        prefix = "-" if descending else ""
+        order_by = [f"{prefix}{field}"]
+        if field != self.tiebreaker:
+            order_by.append(f"{prefix}{self.tiebreaker}")
+
+        queryset = queryset.order_by(*order_by)
+        if cursor:
+            queryset = queryset.filter(
+                self._seek(field, cursor["v"], cursor["i"], descending)
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.order, field = self.get_ordering(request, view)
+
+        return self.paginate(
+            queryset,
+            self.order,
+            field,
+            cursor=self.decode_cursor(request),
+        )
+
+    def get_base_url(self) -> str:
+        return getattr(self, "base_url", None) or (
+            self.request.build_absolute_uri()
+        )
+
+    def _cursor_link(self, item, reverse: bool) -> str:
+        url = self.get_base_url()
+        # Pages may hold model instances or ``.values()`` rows.
+        get = item.get if isinstance(item, dict) else item.__getattribute__
+        cursor = self.encode_cursor({
+            "o": self.order,
+            "v": get(self.field),
+            "i": get(self.tiebreaker),
+            "r": reverse,
+        })
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self._cursor_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.get_base_url(), self.cursor_query_param
+            )
+        return self._cursor_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string", "nullable": True, "format": "uri"
+                },
+                "results": schema,
+            },
+        }
+
+
+class CommentPagination(KeysetPagination):
+    page_size = 10
+    max_page_size = 50
@@ -0,0 +1,41 @@
+from rest_framework.exceptions import ValidationError
+
+
+def get_int_param(
+        request,
+        name: str,
+        default: int | None = None,
+        minimum: int | None = None,
+) -> int | None:
+    value = request.query_params.get(name)
+
+    if not value:
+        return default
+
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError({name: "A valid integer is required."})
+
+    if minimum is not None and value < minimum:
+        raise ValidationError({name: f"Must be at least {minimum}."})
+    return value
+
+
+def get_limit_param(request, name: str, default: int, maximum: int) -> int:
+    """
+    A positive size (``limit``, ``page_size``, ...) capped at ``maximum``.
+    """
+    value = request.query_params.get(name)
+
+    if not value:
+        return default
+
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+
+    if limit < 1:
+        raise ValidationError({name: "Must be a positive integer."})
+    return min(limit, maximum)
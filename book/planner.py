@@ -0,0 +1,178 @@
+from dataclasses import dataclass, field
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from rest_framework import relations, serializers
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    model: type
+    columns: tuple[str, ...] | None
+    select_related: tuple[str, ...] = ()
+    prefetches: tuple[tuple[str, "QueryPlan"], ...] = field(default=())
+
+    def apply(
+            self,
+            queryset: QuerySet,
+            extra_columns: tuple[str, ...] = (),
+    ) -> QuerySet:
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetches:
+            queryset = queryset.prefetch_related(*(
+                Prefetch(
+                    lookup,
+                    queryset=plan.apply(plan.model._default_manager.all()),
+                )
+                for lookup, plan in self.prefetches
+            ))
+        if self.columns is not None:
+            queryset = queryset.only(*self.columns, *extra_columns)
+        return queryset
+
+
+def _unwrap(serializer_field):
+    if isinstance(serializer_field, serializers.ListSerializer):
+        return serializer_field.child, True
+    if isinstance(serializer_field, relations.ManyRelatedField):
+        return serializer_field.child_relation, True
+    return serializer_field, False
+
+
+def _related_columns(child, model) -> tuple[str, ...] | None:
+    if isinstance(child, relations.SlugRelatedField):
+        return (model._meta.pk.name, child.slug_field)
+    if isinstance(child, relations.PrimaryKeyRelatedField):
+        return (model._meta.pk.name, )
+    return None
+
+
+def _plan(model, serializer_fields: dict) -> QueryPlan:
+    columns, select_related, prefetches = {model._meta.pk.name}, [], []
+
+    for serializer_field in serializer_fields.values():
+        if isinstance(serializer_field, serializers.SerializerMethodField):
+            # Opaque to the planner; method fields here only read the pk
+            # or annotations.
+            continue
+
+        source = serializer_field.source
+        if source == "*" or "." in source:
+            columns = None
+            continue
+
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            # Annotations and properties are the view's business.
+            continue
+
+        child, many = _unwrap(serializer_field)
+        if not model_field.is_relation:
+            if columns is not None:
+                columns.add(source)
+            continue
+
+        if isinstance(child, serializers.BaseSerializer):
+            related = _plan(model_field.related_model, child.fields)
+        else:
+            related_model = model_field.related_model
+            related_columns = _related_columns(child, related_model)
+            if related_columns is None:
+                columns = None
+                continue
+            if not many and len(related_columns) == 1:
+                # Rendered from the local foreign key column.
+                if columns is not None:
+                    columns.add(source)
+                continue
+            related = QueryPlan(related_model, related_columns)
+
+        if model_field.many_to_many or model_field.one_to_many:
+            if model_field.one_to_many and related.columns is not None:
+                # The reverse foreign key is needed to match rows up.
+                related = QueryPlan(
+                    related.model,
+                    (*related.columns, model_field.field.name),
+                    related.select_related,
+                    related.prefetches,
+                )
+            prefetches.append((source, related))
+        elif model_field.concrete:
+            select_related.append(source)
+            select_related.extend(
+                f"{source}__{lookup}" for lookup in related.select_related
+            )
+            prefetches.extend(
+                (f"{source}__{lookup}", plan)
+                for lookup, plan in related.prefetches
+            )
+            if columns is not None:
+                if related.columns is None:
+                    columns = None
+                else:
+                    columns.add(source)
+                    columns.update(
+                        f"{source}__{column}" for column in related.columns
+                    )
+        else:
+            # Reverse one-to-one: no column on this side to restrict.
+            columns = None
+
+    return QueryPlan(
+        model=model,
+        columns=tuple(sorted(columns)) if columns is not None else None,
+        select_related=tuple(select_related),
+        prefetches=tuple(prefetches),
+    )
+
+
+_plans = {}
+
+
+def get_query_plan(
+        serializer_class,
+        selected: set[str] | None = None,
+) -> QueryPlan:
+    """
+    Derives the ``select_related``/``prefetch_related``/``only()`` work
+    needed to render ``serializer_class`` (restricted to the ``selected``
+    top-level fields) by walking its nested serializers and relational
+    fields. Plans are cached per serializer class and selection.
+    """
+    key = (
+        serializer_class,
+        frozenset(selected) if selected is not None else None,
+    )
+
+    if key not in _plans:
+        fields = serializer_class().fields
+        if selected is not None:
+            fields = {
+                name: value
+                for name, value in fields.items()
+                if name in selected
+            }
+        _plans[key] = _plan(serializer_class.Meta.model, fields)
+
+    return _plans[key]
+
+
+class QueryPlanMixin:
+    """
+    Shapes ``get_queryset`` results from the serializer of the current
+    action, honouring ``get_field_selection`` when the view has one.
+    """
+
+    def plan_queryset(
+            self,
+            queryset: QuerySet,
+            extra_columns: tuple[str, ...] = (),
+    ) -> QuerySet:
+        get_selection = getattr(self, "get_field_selection", None)
+        plan = get_query_plan(
+            self.get_serializer_class(),
+            get_selection() if get_selection else None,
+        )
+        return plan.apply(queryset, tuple(extra_columns))
@@ -0,0 +1,30 @@
+import datetime
+
+from django.db import connection
+
+from book.models import BookMonthlyStats, BookMonthView
+
+
+def rollup_month_views(before: datetime.date) -> int:
+    """
+    Stores the view count of every book for every month before
+    ``before`` still present in ``BookMonthView``.
+    """
+    quote = connection.ops.quote_name
+    stats_table = quote(BookMonthlyStats._meta.db_table)
+    views_table = quote(BookMonthView._meta.db_table)
+
+    sql = (
+        f"INSERT INTO {stats_table} "
+        f"({quote('book_id')}, {quote('year_month')}, {quote('views')}) "
+        f"SELECT {quote('book_id')}, {quote('month')}, COUNT(*) "
+        f"FROM {views_table} "
+        f"WHERE {quote('month')} < %s "
+        f"GROUP BY {quote('book_id')}, {quote('month')} "
+        f"ON CONFLICT ({quote('book_id')}, {quote('year_month')}) "
+        f"DO UPDATE SET {quote('views')} = excluded.{quote('views')}"
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [connection.ops.adapt_datefield_value(before)])
+        return cursor.rowcount
@@ -0,0 +1,166 @@
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from book.models import Author, Book, Genre
+from book.text import WORD_RE
+
+
+SEARCH_TABLE = "book_search"
+
+# Book text indexed per column: name, summary, author names, genre names.
+INDEX_SOURCE_SQL = f"""
+    SELECT
+        book.id,
+        book.name,
+        book.summary,
+        (
+            SELECT group_concat(
+                author.first_name || ' ' || author.last_name, ' '
+            )
+            FROM {Book.authors.through._meta.db_table} AS book_author
+            JOIN {Author._meta.db_table} AS author
+                ON author.id = book_author.author_id
+            WHERE book_author.book_id = book.id
+        ),
+        (
+            SELECT group_concat(genre.name, ' ')
+            FROM {Book.genres.through._meta.db_table} AS book_genre
+            JOIN {Genre._meta.db_table} AS genre
+                ON genre.id = book_genre.genre_id
+            WHERE book_genre.book_id = book.id
+        )
+    FROM {Book._meta.db_table} AS book
+"""
+
+
+class SQLiteFTSBackend:
+    """
+    Ranked search over an FTS5 table keyed by book id, maintained
+    incrementally by the signals in ``book.signals``.
+    """
+
+    # bm25 weights for name, summary, authors and genres.
+    weights = (10.0, 1.0, 5.0, 2.0)
+
+    def _to_match_query(self, query: str) -> str:
+        tokens = WORD_RE.findall(query)
+
+        if not tokens:
+            return ""
+
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += "*"
+        return " AND ".join(terms)
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[int]:
+        match = self._to_match_query(query)
+
+        if not match:
+            return []
+
+        weights = ", ".join(map(str, self.weights))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH %s "
+                f"ORDER BY bm25({SEARCH_TABLE}, {weights}) "
+                "LIMIT %s OFFSET %s",
+                [match, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def remove_books(self, book_ids: Iterable[int]) -> None:
+        book_ids = list(book_ids)
+
+        if not book_ids:
+            return
+
+        placeholders = ", ".join(["%s"] * len(book_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})",
+                book_ids,
+            )
+
+    def index_books(self, book_ids: Iterable[int]) -> None:
+        book_ids = list(book_ids)
+
+        if not book_ids:
+            return
+
+        self.remove_books(book_ids)
+        placeholders = ", ".join(["%s"] * len(book_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} "
+                "(rowid, name, summary, authors, genres) "
+                f"{INDEX_SOURCE_SQL} WHERE book.id IN ({placeholders})",
+                book_ids,
+            )
+
+    def rebuild(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} "
+                "(rowid, name, summary, authors, genres) "
+                f"{INDEX_SOURCE_SQL}"
+            )
+
+
+class DatabaseSearchBackend:
+    """
+    Unranked ``icontains`` fallback for databases without FTS5.
+    """
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[int]:
+        condition = Q()
+
+        for token in WORD_RE.findall(query):
+            condition &= (
+                Q(name__icontains=token)
+                | Q(summary__icontains=token)
+                | Q(authors__first_name__icontains=token)
+                | Q(authors__last_name__icontains=token)
+                | Q(genres__name__icontains=token)
+            )
+
+        if not condition:
+            return []
+
+        return list(
+            Book.objects.filter(condition).distinct().order_by(
+                "name", "id"
+            ).values_list("id", flat=True)[offset:offset + limit]
+        )
+
+    def remove_books(self, book_ids: Iterable[int]) -> None:
+        pass
+
+    def index_books(self, book_ids: Iterable[int]) -> None:
+        pass
+
+    def rebuild(self) -> None:
+        pass
+
+
+_search_backend = None
+
+
+def get_search_backend() -> SQLiteFTSBackend | DatabaseSearchBackend:
+    global _search_backend
+
+    if _search_backend is None:
+        _search_backend = import_string(
+            getattr(
+                settings,
+                "BOOK_SEARCH_BACKEND",
+                "book.search.SQLiteFTSBackend",
+            )
+        )()
+
+    return _search_backend
@@ -1,6 +1,14 @@
+from django.urls import reverse
 from rest_framework import serializers
 
 from book import models
+from book.batch import MAX_BATCH_SIZE
+from book.comments import book_comments
+from book.fields import SparseFieldsSerializerMixin
+from book.hll import HLL_STANDARD_ERROR
+from book.pagination import CommentPagination
+from book.planner import get_query_plan
+from book.toc import get_book_toc, toc_entry
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -45,7 +53,10 @@ class ChapterListSerializer(ChapterSerializer):
         fields = ["id", "name", "serial_number"]
 
 
-class ChapterDetailSerializer(ChapterSerializer):
+class ChapterDetailSerializer(
+    SparseFieldsSerializerMixin,
+    ChapterSerializer,
+):
     related_chapters = serializers.SerializerMethodField()
 
     class Meta:
@@ -56,33 +67,11 @@ class ChapterDetailSerializer(ChapterSerializer):
             self,
             chapter: models.Chapter
     ) -> dict[str, int | None]:
-        current_serial_number = chapter.serial_number
-        book_id = chapter.book
-
-        previous_chapter_id = self._get_chapter(
-            book_id=book_id,
-            serial_number=current_serial_number - 1
-        )
-        next_chapter_id = self._get_chapter(
-            book_id=book_id,
-            serial_number=current_serial_number + 1
-        )
-
         return {
-            "previous_chapter_id": previous_chapter_id,
-            "next_chapter_id": next_chapter_id,
+            "previous_chapter_id": chapter.previous_chapter_id,
+            "next_chapter_id": chapter.next_chapter_id,
         }
 
-    def _get_chapter(self, book_id: int, serial_number: int) -> int | None:
-        chapter = models.Chapter.objects.filter(
-            book=book_id,
-            serial_number=serial_number
-        ).first()
-
-        if chapter:
-            return chapter.id
-        return None
-
 
 class CommentarySerializer(serializers.ModelSerializer):
 
@@ -147,15 +136,20 @@ class ReplyBookDetailSerializer(CommentDetailSerializer):
         fields = ["id", "author", "content", "date"]
 
 
-class CommentaryBookDetailSerializer(CommentDetailSerializer):
-    replies = ReplyBookDetailSerializer(
-        many=True,
-        read_only=True
-    )
+class CommentaryThreadSerializer(CommentDetailSerializer):
+    replies_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = models.Commentary
-        fields = ["id", "author", "content", "date", "replies"]
+        fields = ["id", "author", "content", "date", "replies_count"]
+
+
+class BookMonthlyStatsSerializer(serializers.ModelSerializer):
+    year_month = serializers.DateField(format="%Y-%m")
+
+    class Meta:
+        model = models.BookMonthlyStats
+        fields = ["year_month", "views"]
 
 
 class BookSerializer(serializers.ModelSerializer):
@@ -173,7 +167,7 @@ class BookSerializer(serializers.ModelSerializer):
         ]
 
 
-class BookListSerializer(BookSerializer):
+class BookListSerializer(SparseFieldsSerializerMixin, BookSerializer):
     genres = serializers.SlugRelatedField(
         many=True,
         read_only=True,
@@ -183,24 +177,53 @@ class BookListSerializer(BookSerializer):
         many=True,
         read_only=True,
     )
+    is_liked = serializers.BooleanField(read_only=True)
+    in_library = serializers.BooleanField(read_only=True)
+    viewed = serializers.BooleanField(read_only=True)
+    views = serializers.IntegerField(
+        source="views_count",
+        read_only=True,
+        help_text=(
+            "Unique viewers. Approximate, within about "
+            f"{HLL_STANDARD_ERROR:.1%} standard error, when view counting "
+            "uses HyperLogLog sketches."
+        ),
+    )
+    likes = serializers.IntegerField(source="likes_count", read_only=True)
+
+    expandable_fields = ("views", "likes")
+
+    class Meta:
+        model = models.Book
+        fields = [
+            "id",
+            "image",
+            "name",
+            "genres",
+            "authors",
+            "pages",
+            "summary",
+            "is_liked",
+            "in_library",
+            "viewed",
+            "views",
+            "likes",
+        ]
 
 
 class BookDetailSerializer(BookListSerializer):
-    chapters = ChapterListSerializer(
-        many=True,
-        read_only=True,
-    )
-    commentaries = CommentaryBookDetailSerializer(
-        many=True,
-        read_only=True
-    )
-    views = serializers.IntegerField()
-    likes = serializers.IntegerField()
+    chapters_count = serializers.SerializerMethodField()
+    first_chapter = serializers.SerializerMethodField()
+    last_chapter = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(read_only=True)
+    comments = serializers.SerializerMethodField()
     authors = AuthorDetailSerializer(
         many=True,
         read_only=True,
     )
 
+    expandable_fields = ()
+
     class Meta:
         model = models.Book
         fields = [
@@ -211,8 +234,74 @@ class BookDetailSerializer(BookListSerializer):
             "authors",
             "pages",
             "summary",
-            "chapters",
-            "commentaries",
+            "chapters_count",
+            "first_chapter",
+            "last_chapter",
+            "comments_count",
+            "comments",
             "views",
             "likes",
+            "is_liked",
+            "in_library",
+            "viewed",
         ]
+
+    def _get_toc(self, book: models.Book) -> dict[str, list]:
+        if not hasattr(book, "_toc"):
+            book._toc = get_book_toc(book.id)
+        return book._toc
+
+    def get_chapters_count(self, book: models.Book) -> int:
+        return len(self._get_toc(book)["ids"])
+
+    def get_first_chapter(self, book: models.Book) -> dict | None:
+        return toc_entry(self._get_toc(book), 0)
+
+    def get_last_chapter(self, book: models.Book) -> dict | None:
+        return toc_entry(self._get_toc(book), -1)
+
+    def get_comments(self, book: models.Book) -> dict:
+        paginator = CommentPagination()
+        paginator.request = self.context["request"]
+        paginator.base_url = paginator.request.build_absolute_uri(
+            reverse("book:book-comments", args=[book.id])
+        )
+
+        comments = paginator.paginate(
+            get_query_plan(CommentaryThreadSerializer).apply(
+                book_comments(book.id)
+            ),
+            order="-date",
+            field="date",
+        )
+
+        return {
+            "next": paginator.get_next_link(),
+            "results": CommentaryThreadSerializer(
+                comments,
+                many=True,
+                context=self.context,
+            ).data,
+        }
+
+
+class DesiredStateSerializer(serializers.Serializer):
+    book_id = serializers.IntegerField(min_value=1)
+    desired_state = serializers.BooleanField()
+
+
+class BatchStateSerializer(serializers.Serializer):
+    items = DesiredStateSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=MAX_BATCH_SIZE,
+    )
+
+    def validate_items(self, items):
+        book_ids = [item["book_id"] for item in items]
+
+        if len(set(book_ids)) != len(book_ids):
+            raise serializers.ValidationError(
+                "Each book_id may appear only once."
+            )
+        return items
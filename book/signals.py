@@ -0,0 +1,214 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from book.conditional import touch_books
+from book.maintenance import enqueue_job
+from book.models import (
+    Author,
+    Book,
+    CatalogChange,
+    Chapter,
+    ChapterTerm,
+    Commentary,
+    Genre,
+)
+from book.facets import bump_facets_version
+from book.search import get_search_backend
+from book.sync import record_changes
+from book.toc import invalidate_book_toc
+from book.typeahead import bump_index_version
+
+
+@receiver(pre_save, sender=Chapter)
+def remember_chapter_book(sender, instance, **kwargs):
+    if instance.pk:
+        instance._previous_book_id = Chapter.objects.filter(
+            pk=instance.pk
+        ).values_list("book_id", flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Chapter)
+def invalidate_chapter_toc(sender, instance, **kwargs):
+    invalidate_book_toc(instance.book_id)
+
+    previous_book_id = getattr(instance, "_previous_book_id", None)
+    if previous_book_id and previous_book_id != instance.book_id:
+        invalidate_book_toc(previous_book_id)
+        ChapterTerm.objects.filter(chapter=instance).update(
+            book=instance.book_id
+        )
+
+
+@receiver(post_save, sender=Chapter)
+def enqueue_chapter_text_indexing(sender, instance, **kwargs):
+    if instance.file:
+        transaction.on_commit(
+            lambda: enqueue_job("book.task.index_chapter_text", instance.id)
+        )
+
+
+@receiver(post_delete, sender=Book)
+def invalidate_deleted_book_toc(sender, instance, **kwargs):
+    invalidate_book_toc(instance.id)
+
+
+@receiver(post_save, sender=Book)
+def index_saved_book(sender, instance, **kwargs):
+    get_search_backend().index_books([instance.id])
+
+
+@receiver(post_delete, sender=Book)
+def unindex_deleted_book(sender, instance, **kwargs):
+    get_search_backend().remove_books([instance.id])
+
+
+def changed_relation_book_ids(instance, action, reverse, pk_set):
+    """
+    Book ids affected by an m2m_changed event on the genres/authors
+    through tables, or None for the events that need no work.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear", "post_clear"):
+        return None
+
+    if not reverse:
+        if action == "pre_clear":
+            return None
+        return [instance.id]
+    elif action == "pre_clear":
+        instance._cleared_book_ids = list(
+            instance.books.values_list("id", flat=True)
+        )
+        return None
+    elif action == "post_clear":
+        return getattr(instance, "_cleared_book_ids", [])
+    return pk_set
+
+
+@receiver(m2m_changed, sender=Book.genres.through)
+@receiver(m2m_changed, sender=Book.authors.through)
+def index_book_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    book_ids = changed_relation_book_ids(instance, action, reverse, pk_set)
+
+    if book_ids is not None:
+        get_search_backend().index_books(book_ids)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Genre)
+def index_related_books(sender, instance, created, **kwargs):
+    if not created:
+        get_search_backend().index_books(
+            instance.books.values_list("id", flat=True)
+        )
+
+
+@receiver(pre_delete, sender=Author)
+@receiver(pre_delete, sender=Genre)
+def remember_related_books(sender, instance, **kwargs):
+    instance._book_ids = list(instance.books.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Genre)
+def reindex_related_books(sender, instance, **kwargs):
+    get_search_backend().index_books(getattr(instance, "_book_ids", []))
+
+
+@receiver([post_save, post_delete], sender=Book)
+@receiver([post_save, post_delete], sender=Author)
+@receiver(m2m_changed, sender=Book.authors.through)
+def refresh_typeahead(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("post_"):
+        bump_index_version()
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Genre)
+@receiver(m2m_changed, sender=Book.genres.through)
+@receiver(m2m_changed, sender=Book.authors.through)
+def refresh_facets(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("post_"):
+        bump_facets_version()
+
+
+@receiver(m2m_changed, sender=Book.genres.through)
+@receiver(m2m_changed, sender=Book.authors.through)
+def touch_related_books(sender, instance, action, reverse, pk_set, **kwargs):
+    book_ids = changed_relation_book_ids(instance, action, reverse, pk_set)
+
+    if book_ids is not None:
+        touch_books(book_ids)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Genre)
+def touch_books_of_saved_relation(sender, instance, created, **kwargs):
+    if not created:
+        touch_books(instance.books.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Genre)
+def touch_books_of_deleted_relation(sender, instance, **kwargs):
+    touch_books(getattr(instance, "_book_ids", []))
+
+
+@receiver([post_save, post_delete], sender=Chapter)
+def touch_chapter_book(sender, instance, **kwargs):
+    touch_books([
+        instance.book_id,
+        getattr(instance, "_previous_book_id", None),
+    ])
+
+
+@receiver([post_save, post_delete], sender=Commentary)
+def touch_commented_book(sender, instance, **kwargs):
+    book_id = instance.book_id
+
+    if instance.parent_id:
+        Commentary.objects.filter(pk=instance.parent_id).update(
+            updated_at=timezone.now()
+        )
+        book_id = Commentary.objects.filter(
+            pk=instance.parent_id
+        ).values_list("book_id", flat=True).first()
+
+    touch_books([book_id])
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Chapter)
+def record_catalog_upsert(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Chapter)
+def record_catalog_delete(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], CatalogChange.DELETE)
+
+    if sender in (Author, Genre):
+        # The through rows went with it, without an m2m_changed signal.
+        record_changes(Book, getattr(instance, "_book_ids", []))
+
+
+@receiver(m2m_changed, sender=Book.genres.through)
+@receiver(m2m_changed, sender=Book.authors.through)
+def record_book_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    book_ids = changed_relation_book_ids(instance, action, reverse, pk_set)
+
+    if book_ids is not None:
+        record_changes(Book, book_ids)
@@ -0,0 +1,78 @@
+from collections.abc import Iterable
+
+from django.db import transaction
+
+from book.hll import HyperLogLog
+from book.models import Book, BookView, BookViewSketch
+
+
+def add_viewers(book_viewers: dict[int, Iterable[int]]) -> dict[int, int]:
+    """
+    Folds the given viewers into each book's all-time sketch and returns
+    the estimate per book. Sketches and ``Book.views_count`` are only
+    written for books whose sketch changed, so repeat viewers cost no
+    writes. Monthly numbers stay exact in ``BookMonthView``.
+    """
+    with transaction.atomic():
+        stored = {
+            sketch.book_id: sketch
+            for sketch in BookViewSketch.objects.select_for_update().filter(
+                book_id__in=list(book_viewers),
+                period=BookViewSketch.ALL_TIME,
+            )
+        }
+        created, changed, estimates = [], [], {}
+        updated_books = []
+
+        for book_id, user_ids in book_viewers.items():
+            sketch = stored.get(book_id)
+            hll = (
+                HyperLogLog.from_bytes(sketch.registers)
+                if sketch else HyperLogLog()
+            )
+            modified = False
+            for user_id in user_ids:
+                modified = hll.add(user_id) or modified
+
+            estimates[book_id] = hll.count()
+            if sketch is None:
+                created.append(BookViewSketch(
+                    book_id=book_id,
+                    period=BookViewSketch.ALL_TIME,
+                    registers=hll.to_bytes(),
+                ))
+            elif modified:
+                sketch.registers = hll.to_bytes()
+                changed.append(sketch)
+            else:
+                continue
+
+            updated_books.append(
+                Book(pk=book_id, views_count=estimates[book_id])
+            )
+
+        BookViewSketch.objects.bulk_create(created)
+        BookViewSketch.objects.bulk_update(changed, ["registers"])
+        Book.objects.bulk_update(updated_books, ["views_count"])
+
+    return estimates
+
+
+def build_sketches_from_view_rows(batch_size: int = 500) -> int:
+    rows = BookView.objects.order_by("book_id").values_list(
+        "book_id", "user_id"
+    ).iterator(chunk_size=10000)
+    book_viewers, built = {}, 0
+
+    for book_id, user_id in rows:
+        if book_id not in book_viewers and len(book_viewers) >= batch_size:
+            add_viewers(book_viewers)
+            built += len(book_viewers)
+            book_viewers = {}
+        book_viewers.setdefault(book_id, []).append(user_id)
+
+    if book_viewers:
+        add_viewers(book_viewers)
+        built += len(book_viewers)
+
+    return built
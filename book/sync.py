@@ -0,0 +1,116 @@
+from collections.abc import Iterable
+
+from django.db.models import Exists, OuterRef, QuerySet
+
+from book import serializers
+from book.models import CatalogChange
+from book.planner import get_query_plan
+
+
+SYNCED_SERIALIZERS = {
+    "genre": serializers.GenreSerializer,
+    "author": serializers.AuthorSerializer,
+    "book": serializers.BookSerializer,
+    "chapter": serializers.ChapterSerializer,
+}
+
+
+def record_changes(
+        model,
+        object_ids: Iterable[int],
+        action: str = CatalogChange.UPSERT,
+) -> None:
+    CatalogChange.objects.bulk_create([
+        CatalogChange(
+            model=model._meta.model_name,
+            object_id=object_id,
+            action=action,
+        )
+        for object_id in dict.fromkeys(object_ids)
+        if object_id
+    ])
+
+
+def superseded_changes() -> QuerySet:
+    """
+    Log entries followed by a newer entry for the same object. Removing
+    them never changes what a client at any cursor receives, so the log
+    stays proportional to the catalog plus its tombstones.
+    """
+    return CatalogChange.objects.filter(
+        Exists(
+            CatalogChange.objects.filter(
+                model=OuterRef("model"),
+                object_id=OuterRef("object_id"),
+                id__gt=OuterRef("id"),
+            )
+        )
+    )
+
+
+def _load_objects(model_name: str, object_ids: list[int], context) -> dict:
+    serializer_class = SYNCED_SERIALIZERS[model_name]
+    queryset = get_query_plan(serializer_class).apply(
+        serializer_class.Meta.model._default_manager.filter(pk__in=object_ids)
+    )
+
+    return {
+        instance.pk: serializer_class(instance, context=context).data
+        for instance in queryset
+    }
+
+
+def get_changes(since: int, limit: int, context=None) -> dict:
+    """
+    Catalog changes with a cursor above ``since``, at most ``limit`` log
+    entries per call. Each object appears once, at its newest entry:
+    upserts carry the current representation, deletes are tombstones.
+    """
+    entries = list(
+        CatalogChange.objects.filter(id__gt=since).order_by("id").values_list(
+            "id", "model", "object_id", "action"
+        )[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for cursor, model_name, object_id, change in entries:
+        latest[model_name, object_id] = cursor, change
+
+    upserts = {}
+    for (model_name, object_id), (_, change) in latest.items():
+        if change == CatalogChange.UPSERT:
+            upserts.setdefault(model_name, []).append(object_id)
+
+    loaded = {
+        model_name: _load_objects(model_name, object_ids, context)
+        for model_name, object_ids in upserts.items()
+        if model_name in SYNCED_SERIALIZERS
+    }
+
+    changes = []
+    for (model_name, object_id), (cursor, change) in sorted(
+        latest.items(), key=lambda item: item[1][0]
+    ):
+        change_data = {
+            "cursor": cursor,
+            "model": model_name,
+            "id": object_id,
+            "action": change,
+        }
+
+        if change == CatalogChange.UPSERT:
+            data = loaded.get(model_name, {}).get(object_id)
+            if data is None:
+                # Deleted since; its tombstone has a later cursor.
+                continue
+            change_data["data"] = data
+
+        changes.append(change_data)
+
+    return {
+        "changes": changes,
+        "next_cursor": entries[-1][0] if entries else since,
+        "has_more": has_more,
+    }
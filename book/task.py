@@ -1,5 +1,88 @@
-from book.models import BookMonthView
+from django.db.models import F, Q
+
+from book.chapter_text import index_chapter
+from book.counters import recount_counters, reset_month_counter
+from book.leaderboard import get_leaderboard
+from book.maintenance import BatchedDeleteJob, enqueue_job
+from book.models import BookMonthView, CatalogChange, Chapter, current_month
+from book.rollup import rollup_month_views
+from book.sketches import build_sketches_from_view_rows
+from book.sync import superseded_changes
+from book.tracking import get_view_buffer
+from book.trending import compute_trending_scores
+
+
+class ClearMonthViewsJob(BatchedDeleteJob):
+    name = "clear_month_views"
+    model = BookMonthView
+
+    def get_queryset(self):
+        return BookMonthView.objects.filter(month__lt=current_month())
+
+    def on_start(self, checkpoint):
+        rollup_month_views(current_month())
+        reset_month_counter()
+        get_leaderboard().rotate()
+
+
+class CompactChangeLogJob(BatchedDeleteJob):
+    name = "compact_change_log"
+    model = CatalogChange
+
+    def get_queryset(self):
+        return superseded_changes()
+
+
+MAINTENANCE_JOBS = {
+    job.name: job for job in (
+        ClearMonthViewsJob,
+        CompactChangeLogJob,
+    )
+}
+
+
+def run_maintenance_job(name, **options):
+    return MAINTENANCE_JOBS[name](**options).run()
 
 
 def clear_month_views():
-    BookMonthView.objects.all().delete()
+    return enqueue_job("book.task.run_maintenance_job", "clear_month_views")
+
+
+def compact_change_log():
+    return enqueue_job(
+        "book.task.run_maintenance_job", "compact_change_log"
+    )
+
+
+def recount_book_counters():
+    return recount_counters()
+
+
+def rebuild_leaderboard():
+    get_leaderboard().rebuild()
+
+
+def flush_view_buffer():
+    return get_view_buffer().flush()
+
+
+def update_trending_scores():
+    return compute_trending_scores()
+
+
+def build_view_sketches():
+    return build_sketches_from_view_rows()
+
+
+def index_chapter_text(chapter_id):
+    return index_chapter(chapter_id)
+
+
+def reindex_chapter_texts():
+    chapter_ids = Chapter.objects.exclude(file="").filter(
+        Q(index_state__isnull=True) | ~Q(index_state__file_name=F("file"))
+    ).values_list("id", flat=True)
+
+    for chapter_id in chapter_ids.iterator():
+        enqueue_job("book.task.index_chapter_text", chapter_id)
@@ -1,3 +1,295 @@
+import datetime
+import hashlib
+import io
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from book import chapter_text, models, serializers, tracking
+from book.maintenance import BatchedDeleteJob
+from book.sync import get_changes, superseded_changes
+from book.task import ClearMonthViewsJob
+from book.planner import get_query_plan
+from book.user_state import annotate_user_state
+from book.values_serializer import get_values_serializer
+
+
+class ValuesSerializerParityTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        fantasy = models.Genre.objects.create(name="Fantasy")
+        science = models.Genre.objects.create(name="Science")
+        ann = models.Author.objects.create(
+            first_name="Ann", last_name="Lee", picture="ann.png"
+        )
+        bob = models.Author.objects.create(
+            first_name="Bob", last_name="Ray", picture=""
+        )
+
+        cls.user = get_user_model().objects.create_user(
+            email="reader@example.com",
+            password="password",
+            first_name="Reader",
+            last_name="One",
+        )
+
+        for index in range(5):
+            book = models.Book.objects.create(
+                name=f"Book {index}",
+                pages=100 + index,
+                summary=f"Summary {index}",
+                image=f"book-{index}.png" if index % 2 else "",
+            )
+            book.genres.set([fantasy, science][:index % 3])
+            book.authors.set([ann, bob][index % 2:])
+
+        first = models.Book.objects.order_by("id").first()
+        cls.user.library.add(first)
+        models.BookLike.objects.create(book=first, user=cls.user)
+
+    def setUp(self):
+        storage = FileSystemStorage(base_url="/media/")
+        for model, name in (
+            (models.Book, "image"),
+            (models.Author, "picture"),
+        ):
+            patcher = mock.patch.object(
+                model._meta.get_field(name), "storage", storage
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        request = APIRequestFactory().get("/api/book/books/")
+        request.user = self.user
+        self.request = request
+
+    def render_both(self, serializer_class, selected=None):
+        context = {"request": self.request, "fields": selected}
+        queryset = annotate_user_state(
+            models.Book.objects.order_by("id"),
+            self.user,
+            selected or serializers.BookListSerializer.Meta.fields,
+        )
+
+        instances = get_query_plan(serializer_class, selected).apply(queryset)
+        expected = serializer_class(instances, many=True, context=context)
+
+        values_serializer = get_values_serializer(serializer_class, selected)
+        rows = queryset.values(*values_serializer.columns)
+        actual = values_serializer.serialize(rows, context)
+
+        renderer = JSONRenderer()
+        return renderer.render(actual), renderer.render(expected.data)
+
+    def test_book_list_output_is_identical(self):
+        actual, expected = self.render_both(
+            serializers.BookListSerializer,
+            serializers.BookListSerializer.select_fields(None, None),
+        )
+        self.assertEqual(actual, expected)
+
+    def test_sparse_book_list_output_is_identical(self):
+        actual, expected = self.render_both(
+            serializers.BookListSerializer,
+            serializers.BookListSerializer.select_fields(
+                {"name", "authors", "in_library"}, {"likes"}
+            ),
+        )
+        self.assertEqual(actual, expected)
+
+    def test_unsupported_serializer_falls_back(self):
+        self.assertIsNone(
+            get_values_serializer(serializers.BookDetailSerializer)
+        )
+
+
+class CatalogSyncTest(TestCase):
+
+    def setUp(self):
+        self.genre = models.Genre.objects.create(name="Fantasy")
+        self.book = models.Book.objects.create(
+            name="Book", pages=100, summary="Summary"
+        )
+        self.cursor = models.CatalogChange.objects.latest("id").id
+
+    def test_changes_are_collapsed_per_object(self):
+        self.book.genres.add(self.genre)
+        self.book.name = "Renamed"
+        self.book.save()
+        genre_id = self.genre.id
+        self.genre.delete()
+
+        changes = get_changes(self.cursor, 100)["changes"]
+
+        self.assertEqual(
+            [(c["model"], c["id"], c["action"]) for c in changes],
+            [
+                ("genre", genre_id, "delete"),
+                ("book", self.book.id, "upsert"),
+            ],
+        )
+        self.assertEqual(changes[1]["data"]["name"], "Renamed")
+        self.assertEqual(changes[1]["data"]["genres"], [])
+
+    def test_compaction_keeps_sync_results(self):
+        self.book.save()
+        self.book.delete()
+        expected = get_changes(0, 100)
+
+        superseded_changes().delete()
+
+        self.assertEqual(get_changes(0, 100)["changes"], expected["changes"])
+
+
+class ChapterTextIndexTest(TestCase):
+
+    def tokenize(self, data: bytes, chunk_size: int) -> dict:
+        with mock.patch.object(chapter_text, "CHUNK_SIZE", chunk_size):
+            return dict(chapter_text.tokenize_stream(
+                io.BytesIO(data), hashlib.sha256()
+            ))
+
+    def test_terms_do_not_depend_on_chunk_boundaries(self):
+        data = "Dragons flew over Zürich, dragons café".encode()
+        expected = self.tokenize(data, chapter_text.CHUNK_SIZE)
+
+        self.assertEqual(expected["dragons"], [0, 26])
+        self.assertEqual(expected["zurich"], [18])
+        for chunk_size in (1, 2, 3, 5, 8, 13):
+            self.assertEqual(self.tokenize(data, chunk_size), expected)
+
+    def test_over_long_words_are_skipped_across_chunks(self):
+        data = ("ab " + "x" * 70000 + " tail").encode()
+
+        for chunk_size in (1, 7, 1000, chapter_text.CHUNK_SIZE):
+            self.assertEqual(
+                self.tokenize(data, chunk_size),
+                {"ab": [0], "tail": [70004]},
+            )
+
+    def test_index_chapter_from_storage(self):
+        storage = FileSystemStorage(location=tempfile.mkdtemp())
+        book = models.Book.objects.create(name="Book", pages=1, summary="")
+        chapter = models.Chapter.objects.create(
+            book=book,
+            name="One",
+            serial_number=1,
+            file=storage.save("one.txt", ContentFile(b"The dragon sleeps")),
+        )
+
+        self.assertEqual(chapter_text.index_chapter(chapter.id, storage), 3)
+        self.assertEqual(
+            chapter_text.search_book_text(book.id, "dragon", 10),
+            [{
+                "chapter_id": chapter.id,
+                "serial_number": 1,
+                "offsets": {"dragon": [4]},
+            }],
+        )
+
+        # A re-upload with the same contents keeps the stored terms.
+        term_ids = set(chapter.terms.values_list("id", flat=True))
+        chapter.file = storage.save(
+            "two.txt", ContentFile(b"The dragon sleeps")
+        )
+        chapter.save()
+        chapter_text.index_chapter(chapter.id, storage)
+
+        self.assertEqual(
+            set(chapter.terms.values_list("id", flat=True)), term_ids
+        )
+        self.assertEqual(
+            models.ChapterIndexState.objects.get(chapter=chapter).file_name,
+            "two.txt",
+        )
+
+
+class ClearMonthViewsTest(TestCase):
+
+    def setUp(self):
+        self.book = models.Book.objects.create(
+            name="Book", pages=1, summary=""
+        )
+        self.users = [
+            get_user_model().objects.create_user(
+                email=f"reader{index}@example.com",
+                password="password",
+                first_name="Reader",
+                last_name=str(index),
+            )
+            for index in range(3)
+        ]
+        self.this_month = models.current_month()
+        self.last_month = (
+            self.this_month - datetime.timedelta(days=1)
+        ).replace(day=1)
+
+        for user in self.users:
+            models.BookMonthView.objects.create(
+                book=self.book, user=user, month=self.last_month
+            )
+        models.Book.objects.update(month_views_count=len(self.users))
+
+    def assert_cleared(self, month_views: int):
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.month_views_count, month_views)
+        self.assertFalse(
+            models.BookMonthView.objects.filter(
+                month__lt=self.this_month
+            ).exists()
+        )
+        self.assertEqual(
+            models.BookMonthView.objects.filter(
+                month=self.this_month
+            ).count(),
+            month_views,
+        )
+        self.assertEqual(
+            models.BookMonthlyStats.objects.get(
+                book=self.book, year_month=self.last_month
+            ).views,
+            len(self.users),
+        )
+        self.assertFalse(models.MaintenanceCheckpoint.objects.exists())
+
+    def test_returning_reader_is_counted_while_clearing(self):
+        job = ClearMonthViewsJob(batch_size=1, sleep=0)
+        job._get_checkpoint()
+
+        tracking.record_view(self.book, self.users[0])
+        tracking.write_view_events([(self.users[1].id, self.book.id)])
+        job.run()
+
+        self.assert_cleared(month_views=2)
+
+    def test_interrupted_clear_resumes_from_checkpoint(self):
+        delete_batch = BatchedDeleteJob.process_batch
+        batches = []
+
+        def fail_after_first_batch(job, queryset):
+            if batches:
+                raise RuntimeError("worker stopped")
+            batches.append(queryset)
+            return delete_batch(job, queryset)
+
+        with mock.patch.object(
+            ClearMonthViewsJob, "process_batch", fail_after_first_batch
+        ):
+            with self.assertRaises(RuntimeError):
+                ClearMonthViewsJob(batch_size=1, sleep=0).run()
+
+        self.assertEqual(models.BookMonthView.objects.count(), 2)
+
+        with mock.patch.object(ClearMonthViewsJob, "on_start") as on_start:
+            deleted = ClearMonthViewsJob(batch_size=1, sleep=0).run()
 
-# Create your tests here.
+        on_start.assert_not_called()
+        self.assertEqual(deleted, 2)
+        self.assert_cleared(month_views=0)
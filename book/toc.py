@@ -0,0 +1,68 @@
+from bisect import bisect_right
+
+from django.core.cache import cache
+
+from book.models import Book, Chapter
+
+
+TOC_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def toc_cache_key(book_id: int) -> str:
+    return f"book:{book_id}:toc"
+
+
+def get_book_toc(book_id: int) -> dict[str, list] | None:
+    """
+    Returns the book's chapters as parallel ``ids``/``names``/
+    ``serial_numbers`` lists ordered by serial number, or None when the
+    book does not exist. Cached per book until a chapter changes.
+    """
+    key = toc_cache_key(book_id)
+    toc = cache.get(key)
+
+    if toc is None:
+        rows = list(
+            Chapter.objects.filter(book=book_id).order_by(
+                "serial_number"
+            ).values_list("id", "name", "serial_number")
+        )
+
+        if not rows and not Book.objects.filter(pk=book_id).exists():
+            return None
+
+        ids, names, serial_numbers = map(list, zip(*rows)) if rows else (
+            [], [], []
+        )
+        toc = {"ids": ids, "names": names, "serial_numbers": serial_numbers}
+        cache.set(key, toc, TOC_CACHE_TIMEOUT)
+
+    return toc
+
+
+def invalidate_book_toc(book_id: int) -> None:
+    cache.delete(toc_cache_key(book_id))
+
+
+def slice_toc(toc: dict[str, list], after: int, limit: int) -> dict:
+    start = bisect_right(toc["serial_numbers"], after)
+    end = start + limit
+
+    page = {column: values[start:end] for column, values in toc.items()}
+    page["next_after"] = (
+        page["serial_numbers"][-1]
+        if end < len(toc["serial_numbers"])
+        else None
+    )
+    return page
+
+
+def toc_entry(toc: dict[str, list], index: int) -> dict | None:
+    if not toc["ids"]:
+        return None
+
+    return {
+        "id": toc["ids"][index],
+        "name": toc["names"][index],
+        "serial_number": toc["serial_numbers"][index],
+    }
@@ -0,0 +1,238 @@
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django_q.brokers.redis_broker import Redis as RedisBroker
+from django_q.tasks import async_task
+
+from book import counters, sketches
+from book.batch import create_missing_links
+from book.leaderboard import get_leaderboard
+from book.models import Book, BookMonthView, BookView, current_month
+
+
+ViewEvent = tuple[int, int]
+
+logger = logging.getLogger(__name__)
+
+
+def get_tracking_settings() -> dict:
+    return {
+        "mode": "immediate",
+        "buffer": "local",
+        "max_size": 1000,
+        "flush_interval": 30,
+        "counting": "exact",
+        "view_rows": True,
+        **getattr(settings, "BOOK_VIEW_TRACKING", {}),
+    }
+
+
+def _new_events(queryset, events: set[ViewEvent]) -> set[ViewEvent]:
+    existing = queryset.filter(
+        user_id__in={user_id for user_id, _ in events},
+        book_id__in={book_id for _, book_id in events},
+    ).values_list("user_id", "book_id")
+
+    return events - set(existing)
+
+
+def _count_new_events(events: Iterable[ViewEvent], field: str) -> None:
+    books_by_delta = defaultdict(list)
+    for book_id, delta in Counter(book_id for _, book_id in events).items():
+        books_by_delta[delta].append(book_id)
+
+    for delta, book_ids in books_by_delta.items():
+        counters.increment_counters(book_ids, field, delta)
+
+
+def write_view_events(events: Iterable[ViewEvent]) -> int:
+    events = set(events)
+
+    if not events:
+        return 0
+
+    config = get_tracking_settings()
+    book_ids = {book_id for _, book_id in events}
+
+    with transaction.atomic():
+        if config["view_rows"] or config["counting"] != "sketch":
+            created = create_missing_links(
+                BookView, _new_events(BookView.objects.all(), events)
+            )
+            if config["counting"] != "sketch":
+                _count_new_events(created, "views_count")
+
+        month = current_month()
+        _count_new_events(
+            create_missing_links(
+                BookMonthView,
+                _new_events(BookMonthView.objects.filter(month=month), events),
+                month=month,
+            ),
+            "month_views_count",
+        )
+
+        if config["counting"] == "sketch":
+            book_viewers = defaultdict(set)
+            for user_id, book_id in events:
+                book_viewers[book_id].add(user_id)
+            sketches.add_viewers(book_viewers)
+
+    get_leaderboard().sync(book_ids)
+    return len(events)
+
+
+class LocalViewBuffer:
+    """
+    Per-process buffer drained by a background thread every
+    ``flush_interval`` seconds, or as soon as it holds ``max_size``
+    events, and when the process exits. Requests only add to it.
+    """
+
+    def __init__(self, max_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._events: set[ViewEvent] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker = None
+
+        atexit.register(self.flush)
+
+    def _ensure_worker(self) -> None:
+        # Started lazily so that each forked web worker runs its own.
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run,
+                name="view-buffer-flush",
+                daemon=True,
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing the view buffer failed")
+            finally:
+                close_old_connections()
+
+    def add(self, user_id: int, book_id: int) -> None:
+        with self._lock:
+            self._events.add((user_id, book_id))
+            self._ensure_worker()
+            full = len(self._events) >= self.max_size
+
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        with self._lock:
+            events, self._events = self._events, set()
+
+        return write_view_events(events)
+
+
+class RedisViewBuffer:
+    """
+    Buffer shared by all web workers. The periodic
+    ``book.task.flush_view_buffer`` schedule drains it on the interval,
+    and a flush is enqueued early once it grows past ``max_size``.
+    """
+
+    key = "booklink:view-buffer"
+    flush_lock_key = "booklink:view-buffer:flush-lock"
+
+    def __init__(self, max_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.connection = RedisBroker.get_connection()
+
+    def add(self, user_id: int, book_id: int) -> None:
+        pipeline = self.connection.pipeline()
+        pipeline.sadd(self.key, f"{user_id}:{book_id}")
+        pipeline.scard(self.key)
+        _, size = pipeline.execute()
+
+        if size >= self.max_size and self.connection.set(
+            self.flush_lock_key, 1, nx=True, ex=int(self.flush_interval)
+        ):
+            async_task("book.task.flush_view_buffer")
+
+    def flush(self) -> int:
+        flushed = 0
+
+        while members := self.connection.spop(self.key, self.max_size):
+            flushed += write_view_events(
+                tuple(map(int, member.split(b":"))) for member in members
+            )
+
+        self.connection.delete(self.flush_lock_key)
+        return flushed
+
+
+VIEW_BUFFERS = {
+    "local": LocalViewBuffer,
+    "redis": RedisViewBuffer,
+}
+
+_view_buffer = None
+
+
+def get_view_buffer() -> LocalViewBuffer | RedisViewBuffer:
+    global _view_buffer
+
+    if _view_buffer is None:
+        config = get_tracking_settings()
+        _view_buffer = VIEW_BUFFERS[config["buffer"]](
+            max_size=config["max_size"],
+            flush_interval=config["flush_interval"],
+        )
+
+    return _view_buffer
+
+
+def record_view(book: Book, user) -> None:
+    config = get_tracking_settings()
+
+    if config["mode"] == "buffered":
+        get_view_buffer().add(user.id, book.id)
+        return
+
+    with transaction.atomic():
+        if config["counting"] == "sketch":
+            book.views_count = sketches.add_viewers(
+                {book.id: [user.id]}
+            )[book.id]
+
+            if config["view_rows"]:
+                BookView.objects.get_or_create(book=book, user=user)
+        else:
+            _, created = BookView.objects.get_or_create(
+                book=book,
+                user=user
+            )
+            if created:
+                counters.increment_counter(book.id, "views_count")
+                book.views_count += 1
+
+        _, created = BookMonthView.objects.get_or_create(
+            book=book,
+            user=user,
+            month=current_month(),
+        )
+        if created:
+            counters.increment_counter(book.id, "month_views_count")
+            book.month_views_count += 1
+
+    if created:
+        get_leaderboard().add_view(book.id)
@@ -0,0 +1,82 @@
+import datetime
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from book.models import Book, BookLike, BookView
+
+
+def get_trending_settings() -> dict:
+    return {
+        "half_life_hours": 72,
+        "window_days": 30,
+        "view_weight": 1.0,
+        "like_weight": 3.0,
+        "batch_size": 1000,
+        **getattr(settings, "BOOK_TRENDING", {}),
+    }
+
+
+def load_events(
+        model,
+        since: datetime.datetime,
+) -> tuple[np.ndarray, np.ndarray]:
+    rows = model.objects.filter(
+        created_at__gte=since
+    ).values_list("book_id", "created_at").iterator(chunk_size=10000)
+
+    events = np.fromiter(
+        ((book_id, created_at.timestamp()) for book_id, created_at in rows),
+        dtype=np.dtype([("book_id", np.int64), ("timestamp", np.float64)]),
+    )
+
+    return events["book_id"], events["timestamp"]
+
+
+def compute_scores(
+        book_ids: np.ndarray,
+        timestamps: np.ndarray,
+        weights: np.ndarray,
+        now: float,
+        half_life: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    decay = np.exp2(-(now - timestamps) / half_life)
+    unique_ids, positions = np.unique(book_ids, return_inverse=True)
+    scores = np.bincount(positions, weights=weights * decay)
+
+    return unique_ids, scores
+
+
+def compute_trending_scores() -> int:
+    config = get_trending_settings()
+    now = timezone.now()
+    since = now - datetime.timedelta(days=config["window_days"])
+
+    view_ids, view_timestamps = load_events(BookView, since)
+    like_ids, like_timestamps = load_events(BookLike, since)
+
+    book_ids, scores = compute_scores(
+        np.concatenate([view_ids, like_ids]),
+        np.concatenate([view_timestamps, like_timestamps]),
+        np.concatenate([
+            np.full(view_ids.size, config["view_weight"]),
+            np.full(like_ids.size, config["like_weight"]),
+        ]),
+        now=now.timestamp(),
+        half_life=config["half_life_hours"] * 3600,
+    )
+
+    with transaction.atomic():
+        Book.objects.filter(trending_score__gt=0).update(trending_score=0)
+        Book.objects.bulk_update(
+            [
+                Book(pk=book_id, trending_score=score)
+                for book_id, score in zip(book_ids.tolist(), scores.tolist())
+            ],
+            ["trending_score"],
+            batch_size=config["batch_size"],
+        )
+
+    return book_ids.size
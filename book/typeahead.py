@@ -0,0 +1,141 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+from book.cache_versions import bump_cache_version, get_cache_version
+from book.models import Author, Book
+from book.text import normalize
+
+
+TYPEAHEAD_VERSION_KEY = "typeahead:version"
+TYPEAHEAD_MAX_AGE = 10 * 60
+TYPEAHEAD_TOP_K = 10
+
+# Prefixes this short match too many keys to rank on every keystroke,
+# so their top-K lists are computed while the index is built.
+SHORT_PREFIX_LENGTH = 2
+
+
+def word_suffixes(text: str) -> set[str]:
+    words = normalize(text).split()
+    return {" ".join(words[index:]) for index in range(len(words))}
+
+
+class PrefixIndex:
+    """
+    Sorted array of normalized keys, one per word suffix of every title
+    or author name, searched with bisect. Entries are ``(popularity, id,
+    payload)`` tuples so ranking needs no database access.
+    """
+
+    def __init__(self, entries: list[tuple[str, tuple]]):
+        entries.sort(key=lambda entry: entry[0])
+        self.keys = [key for key, _ in entries]
+        self.items = [item for _, item in entries]
+        self.short_prefixes = self._rank_short_prefixes()
+
+    def _rank_short_prefixes(self) -> dict[str, list[tuple]]:
+        candidates = defaultdict(dict)
+
+        for key, item in zip(self.keys, self.items):
+            for length in range(1, min(len(key), SHORT_PREFIX_LENGTH) + 1):
+                candidates[key[:length]][item[1]] = item
+
+        return {
+            prefix: heapq.nlargest(TYPEAHEAD_TOP_K, items.values())
+            for prefix, items in candidates.items()
+        }
+
+    def lookup(self, prefix: str, limit: int) -> list[tuple]:
+        prefix = normalize(prefix)
+
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX_LENGTH:
+            return self.short_prefixes.get(prefix, [])[:limit]
+
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010ffff", lo=start)
+        matches = {item[1]: item for item in self.items[start:end]}
+
+        return heapq.nlargest(limit, matches.values())
+
+
+def build_book_index() -> PrefixIndex:
+    entries = []
+
+    for book_id, name, views in Book.objects.values_list(
+        "id", "name", "views_count"
+    ).iterator():
+        item = (views, book_id, {"id": book_id, "name": name})
+        entries.extend((key, item) for key in word_suffixes(name))
+
+    return PrefixIndex(entries)
+
+
+def build_author_index() -> PrefixIndex:
+    entries = []
+
+    for author_id, first_name, last_name, views in Author.objects.annotate(
+        views=Coalesce(Sum("books__views_count"), 0)
+    ).values_list("id", "first_name", "last_name", "views").iterator():
+        item = (views, author_id, {
+            "id": author_id,
+            "first_name": first_name,
+            "last_name": last_name,
+        })
+        entries.extend(
+            (key, item)
+            for key in word_suffixes(f"{first_name} {last_name}")
+        )
+
+    return PrefixIndex(entries)
+
+
+_indexes = None
+_indexes_version = None
+_indexes_built_at = 0.0
+_indexes_lock = threading.Lock()
+
+
+def _is_current(version) -> bool:
+    return (
+        _indexes is not None
+        and version == _indexes_version
+        and time.monotonic() - _indexes_built_at < TYPEAHEAD_MAX_AGE
+    )
+
+
+def get_indexes() -> dict[str, PrefixIndex]:
+    global _indexes, _indexes_version, _indexes_built_at
+
+    version = get_cache_version(TYPEAHEAD_VERSION_KEY)
+    if _is_current(version):
+        return _indexes
+
+    with _indexes_lock:
+        if not _is_current(version):
+            _indexes = {
+                "books": build_book_index(),
+                "authors": build_author_index(),
+            }
+            _indexes_version = version
+            _indexes_built_at = time.monotonic()
+
+    return _indexes
+
+
+def bump_index_version() -> None:
+    bump_cache_version(TYPEAHEAD_VERSION_KEY)
+
+
+def suggest(prefix: str, limit: int = TYPEAHEAD_TOP_K) -> dict[str, list]:
+    return {
+        kind: [payload for _, _, payload in index.lookup(prefix, limit)]
+        for kind, index in get_indexes().items()
+    }
@@ -15,11 +15,22 @@ router.register("chapters", views.ChapterViewSet)
 urlpatterns = [
     path("", include(router.urls)),
     path("library/", views.UserLibraryView.as_view(), name="user-library"),
+    path("sync/", views.CatalogSyncView.as_view(), name="catalog-sync"),
+    path(
+        "books/<int:pk>/comments/",
+        views.BookCommentListView.as_view(),
+        name="book-comments"
+    ),
     path(
         "books/<int:pk>/add-comment/",
         views.CommentaryCreateView.as_view(),
         name="add-comment"
     ),
+    path(
+        "commentaries/<int:pk>/replies/",
+        views.CommentaryReplyListView.as_view(),
+        name="commentary-replies",
+    ),
     path(
         "commentaries/<int:pk>/add-reply/",
         views.ReplyCreateView.as_view(),
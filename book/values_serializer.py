@@ -0,0 +1,242 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+
+
+class UnsupportedSerializer(Exception):
+    pass
+
+
+def _scalar_spec(model, serializer_field) -> tuple:
+    source = serializer_field.source
+
+    if source == "*" or "." in source or isinstance(
+        serializer_field,
+        (serializers.SerializerMethodField, relations.RelatedField),
+    ):
+        raise UnsupportedSerializer(serializer_field.field_name)
+
+    try:
+        model_field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        # An annotation, fetched by name.
+        return serializer_field.field_name, source, None
+
+    if model_field.is_relation:
+        raise UnsupportedSerializer(serializer_field.field_name)
+    if isinstance(model_field, models.FileField):
+        return serializer_field.field_name, source, model_field
+    return serializer_field.field_name, source, None
+
+
+def _compile_scalars(model, fields: dict) -> list[tuple]:
+    return [_scalar_spec(model, field) for field in fields.values()]
+
+
+class ValuesSerializer:
+    """
+    Read-only list serialization from ``.values()`` rows. Scalar fields
+    are read straight from the row and many-to-many fields are loaded with
+    one grouped query each, then every value goes through the bound DRF
+    field's ``to_representation`` so the output matches the regular
+    serializer exactly. Supports plain fields, annotations, file fields,
+    many ``SlugRelatedField``/``PrimaryKeyRelatedField`` and many nested
+    serializers made of such scalars.
+    """
+
+    def __init__(self, serializer_class, fields: dict):
+        model = serializer_class.Meta.model
+        self.serializer_class = serializer_class
+        self.model = model
+        self.pk_name = model._meta.pk.name
+        self.scalars, self.relations = [], []
+
+        for name, field in fields.items():
+            if not isinstance(
+                field, (serializers.ListSerializer, relations.ManyRelatedField)
+            ):
+                self.scalars.append(_scalar_spec(model, field))
+                continue
+
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                raise UnsupportedSerializer(name)
+            if not model_field.many_to_many:
+                raise UnsupportedSerializer(name)
+
+            related_model = model_field.related_model
+            if isinstance(field, serializers.ListSerializer):
+                kind = "nested"
+                nested = _compile_scalars(related_model, field.child.fields)
+                columns = [source for _, source, _ in nested]
+            elif isinstance(field.child_relation, relations.SlugRelatedField):
+                kind, nested = "slug", None
+                columns = [field.child_relation.slug_field]
+            elif isinstance(
+                field.child_relation, relations.PrimaryKeyRelatedField
+            ):
+                kind, nested = "pk", None
+                columns = [related_model._meta.pk.name]
+            else:
+                raise UnsupportedSerializer(name)
+
+            if isinstance(model_field, models.ManyToManyField):
+                lookup = model_field.related_query_name()
+            else:
+                lookup = model_field.field.name
+
+            self.relations.append(
+                (name, kind, related_model, lookup, columns, nested)
+            )
+
+        self.columns = [self.pk_name] + [
+            source for _, source, _ in self.scalars
+        ]
+
+    def _load_relations(self, pks: list) -> dict[str, dict]:
+        loaded = {}
+
+        for name, kind, related_model, lookup, columns, _ in self.relations:
+            grouped = defaultdict(list)
+            for owner, *values in related_model._default_manager.filter(
+                **{f"{lookup}__in": pks}
+            ).values_list(lookup, *columns):
+                grouped[owner].append(values)
+            loaded[name] = grouped
+
+        return loaded
+
+    def _render_scalars(self, specs, bound_fields, row: dict) -> dict:
+        data = {}
+
+        for name, source, file_field in specs:
+            value = row[source]
+
+            if file_field is not None:
+                value = file_field.attr_class(None, file_field, value)
+            elif value is None:
+                data[name] = None
+                continue
+
+            data[name] = bound_fields[name].to_representation(value)
+
+        return data
+
+    def serialize(self, rows: Iterable[dict], context: dict) -> list[dict]:
+        rows = list(rows)
+        bound_fields = self.serializer_class(context=context).fields
+        loaded = self._load_relations([row[self.pk_name] for row in rows])
+        scalar_names = {name for name, _, _ in self.scalars}
+        nested_fields = {
+            name: bound_fields[name].child.fields
+            for name, kind, *_ in self.relations
+            if kind == "nested"
+        }
+        specs = {
+            name: (kind, nested)
+            for name, kind, _, _, _, nested in self.relations
+        }
+
+        results = []
+        for row in rows:
+            scalars = self._render_scalars(self.scalars, bound_fields, row)
+            data = {}
+
+            for name in bound_fields:
+                if name in scalar_names:
+                    data[name] = scalars[name]
+                    continue
+
+                kind, nested = specs[name]
+                values = loaded[name].get(row[self.pk_name], [])
+                if kind == "nested":
+                    data[name] = [
+                        self._render_scalars(
+                            nested,
+                            nested_fields[name],
+                            dict(zip((s for _, s, _ in nested), value)),
+                        )
+                        for value in values
+                    ]
+                else:
+                    data[name] = [value for value, in values]
+
+            results.append(data)
+
+        return results
+
+
+_values_serializers = {}
+
+
+def get_values_serializer(
+        serializer_class,
+        selected: set[str] | None = None,
+) -> ValuesSerializer | None:
+    """
+    Compiles (once per serializer class and field selection) a
+    ``ValuesSerializer``, or returns None when some field needs the
+    regular serializer.
+    """
+    key = (
+        serializer_class,
+        frozenset(selected) if selected is not None else None,
+    )
+
+    if key not in _values_serializers:
+        fields = serializer_class(
+            context={"fields": selected}
+        ).fields
+        try:
+            _values_serializers[key] = ValuesSerializer(
+                serializer_class, dict(fields)
+            )
+        except UnsupportedSerializer:
+            _values_serializers[key] = None
+
+    return _values_serializers[key]
+
+
+class ValuesListMixin:
+    """
+    Serves ``list`` through ``ValuesSerializer`` when the serializer of
+    the action supports it and ``BOOK_VALUES_SERIALIZATION`` is on.
+    """
+
+    def get_values_serializer(self) -> ValuesSerializer | None:
+        if not getattr(settings, "BOOK_VALUES_SERIALIZATION", True):
+            return None
+
+        get_selection = getattr(self, "get_field_selection", None)
+        return get_values_serializer(
+            self.get_serializer_class(),
+            get_selection() if get_selection else None,
+        )
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.prefetch_related(None).values(*dict.fromkeys([
+            *values_serializer.columns,
+            *getattr(self, "cursor_orderings", {}).values(),
+        ]))
+
+        page = self.paginate_queryset(rows)
+        data = values_serializer.serialize(
+            rows if page is None else page,
+            self.get_serializer_context(),
+        )
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
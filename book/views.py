@@ -1,98 +1,168 @@
 from rest_framework import mixins, generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.viewsets import GenericViewSet
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
-from django.db.models.aggregates import Count
-
-from book import models, serializers
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+
+from book.batch import apply_desired_states
+from book.chapter_text import search_book_text
+from book.conditional import (
+    ConditionalListMixin,
+    check_not_modified,
+    make_etag,
+    representation_key,
+    set_validators,
+)
+from book.fields import SparseFieldsViewMixin
+from book.facets import FACET_FILTERS, filter_books, get_book_facets
+from book import comments, counters, models, serializers, tracking
+from book.leaderboard import get_leaderboard
+from book.pagination import CommentPagination, KeysetPagination
+from book.params import get_int_param, get_limit_param
+from book.planner import QueryPlanMixin
+from book.search import get_search_backend
+from book.sync import get_changes
+from book.toc import get_book_toc, slice_toc
+from book.typeahead import TYPEAHEAD_TOP_K, suggest
+from book.user_state import annotate_user_state
+from book.values_serializer import ValuesListMixin
+
+
+POPULAR_BOOKS_LIMIT = 20
+POPULAR_BOOKS_MAX_LIMIT = 100
+MONTHLY_VIEWS_LIMIT = 12
+MONTHLY_VIEWS_MAX_LIMIT = 120
+TOC_PAGE_SIZE = 100
+TOC_MAX_PAGE_SIZE = 1000
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+TEXT_SEARCH_LIMIT = 50
+TEXT_SEARCH_MAX_LIMIT = 500
+MULTI_GET_MAX_IDS = 100
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 1000
 
 
 class GenreViewSet(
+    ConditionalListMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
     queryset = models.Genre.objects.all()
     serializer_class = serializers.GenreSerializer
+    pagination_class = KeysetPagination
+    cursor_orderings = {"id": "id", "name": "name"}
 
 
 class AuthorViewSet(
+    ConditionalListMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
     queryset = models.Author.objects.all()
     serializer_class = serializers.AuthorSerializer
+    pagination_class = KeysetPagination
+    cursor_orderings = {"id": "id"}
 
 
 class BookViewSet(
+    SparseFieldsViewMixin,
+    QueryPlanMixin,
+    ValuesListMixin,
     mixins.ListModelMixin,
     GenericViewSet
 ):
-    queryset = models.Book.objects.prefetch_related("genres", "authors")
+    queryset = models.Book.objects.all()
     permission_classes = (IsAuthenticated, )
     authentication_classes = (JWTAuthentication, )
+    pagination_class = KeysetPagination
+    cursor_orderings = {
+        "id": "id",
+        "name": "name",
+        "likes": "likes_count",
+        "views": "views_count",
+        "month_views": "month_views_count",
+    }
 
-    def _filter_by_genre_id(self, queryset):
-        genre_id = self.request.query_params.get("genre_id")
-
-        if genre_id:
-            queryset = queryset.filter(genres__id=genre_id)
-
-        return queryset
-
-    def _filter_by_author_id(self, queryset):
-        author_id = self.request.query_params.get("author_id")
-
-        if author_id:
-            queryset = queryset.filter(authors__id=author_id)
-
-        return queryset
-
-    def _order_queryset(self, queryset):
-        order = self.request.query_params.get("order")
+    def _get_int_param(self, name: str) -> int | None:
+        return get_int_param(self.request, name)
 
-        if order:
-            queryset = queryset.order_by(order)
+    def _get_limit_param(self, name: str, default: int, maximum: int) -> int:
+        return get_limit_param(self.request, name, default, maximum)
 
-        return queryset
+    def get_filter_params(self) -> dict[str, int | None]:
+        return {name: self._get_int_param(name) for name in FACET_FILTERS}
 
     def filter_by_query_params(self, queryset):
-        queryset = self._filter_by_genre_id(queryset)
-        queryset = self._filter_by_author_id(queryset)
-        queryset = self._order_queryset(queryset)
-
-        return queryset
+        return filter_books(queryset, self.get_filter_params())
 
     def get_queryset(self):
         queryset = self.queryset
 
-        if self.action == "retrieve":
-            return queryset.prefetch_related(
-                "chapters",
-                "commentaries__replies__author",
-                "commentaries__author"
-            ).annotate(
-                views=Count("viewed_by", distinct=True),
-                likes=Count("liked_by", distinct=True),
+        if self.action in ("search_text", "toggle_library", "toggle_like"):
+            return models.Book.objects.only("id")
+        if self.action in (
+            "list",
+            "retrieve",
+            "popular_this_month",
+            "trending",
+            "search",
+            "multi_get",
+        ):
+            selected = self.get_field_selection()
+            queryset = annotate_user_state(
+                self.plan_queryset(
+                    queryset,
+                    extra_columns=self.cursor_orderings.values(),
+                ),
+                self.request.user,
+                selected,
             )
-        elif self.action == "popular_this_month":
-            return queryset.annotate(
-                month_views=Count("viewed_by_this_month")
-            ).order_by("-month_views")
+
+        if self.action == "retrieve":
+            if "comments_count" in selected:
+                queryset = queryset.annotate(
+                    comments_count=comments.comments_count(),
+                )
+            return queryset
+        elif self.action in ("popular_this_month", "search", "multi_get"):
+            return queryset
+        elif self.action == "trending":
+            return queryset.filter(
+                trending_score__gt=0
+            ).order_by("-trending_score", "-id")
 
         queryset = self.filter_by_query_params(queryset)
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+
+        if request.query_params.get("facets") in ("1", "true"):
+            response.data["facets"] = get_book_facets(
+                self.get_filter_params()
+            )
+
+        return response
+
     def get_serializer_class(self):
-        if self.action in ("list", "popular_this_month"):
+        if self.action in (
+            "list", "popular_this_month", "trending", "search", "multi_get"
+        ):
             return serializers.BookListSerializer
         if self.action == "retrieve":
             return serializers.BookDetailSerializer
+        if self.action == "monthly_views":
+            return serializers.BookMonthlyStatsSerializer
         return serializers.BookSerializer
 
     @action(
@@ -102,7 +172,175 @@ class BookViewSet(
         url_name="popular-this-month",
     )
     def popular_this_month(self, request, *args, **kwargs):
-        return self.list(self, request, *args, **kwargs)
+        genre_id = self._get_int_param("genre_id")
+        limit = self._get_limit_param(
+            "limit", POPULAR_BOOKS_LIMIT, POPULAR_BOOKS_MAX_LIMIT
+        )
+
+        book_ids = get_leaderboard().top(limit, genre_id=genre_id)
+        books = self.get_queryset().in_bulk(book_ids)
+
+        serializer = self.get_serializer(
+            [books[book_id] for book_id in book_ids if book_id in books],
+            many=True,
+        )
+        return Response(serializer.data)
+
+    @action(
+        methods=["get"],
+        detail=False,
+        url_path="trending",
+        url_name="trending",
+    )
+    def trending(self, request, *args, **kwargs):
+        limit = self._get_limit_param(
+            "limit", POPULAR_BOOKS_LIMIT, POPULAR_BOOKS_MAX_LIMIT
+        )
+
+        serializer = self.get_serializer(
+            self.get_queryset()[:limit],
+            many=True,
+        )
+        return Response(serializer.data)
+
+    @action(
+        methods=["get"],
+        detail=False,
+        url_path="search",
+        url_name="search",
+    )
+    def search(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "")
+        page = max(self._get_int_param("page") or 1, 1)
+        page_size = self._get_limit_param(
+            "page_size", SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE
+        )
+
+        book_ids = get_search_backend().search(
+            query,
+            limit=page_size + 1,
+            offset=(page - 1) * page_size,
+        )
+        has_next = len(book_ids) > page_size
+        book_ids = book_ids[:page_size]
+        books = self.get_queryset().in_bulk(book_ids)
+
+        serializer = self.get_serializer(
+            [books[book_id] for book_id in book_ids if book_id in books],
+            many=True,
+        )
+        url = request.build_absolute_uri()
+
+        return Response({
+            "next": (
+                replace_query_param(url, "page", page + 1)
+                if has_next else None
+            ),
+            "previous": (
+                replace_query_param(url, "page", page - 1)
+                if page > 1 else None
+            ),
+            "results": serializer.data,
+        })
+
+    @action(
+        methods=["get"],
+        detail=False,
+        url_path="batch",
+        url_name="batch",
+    )
+    def multi_get(self, request, *args, **kwargs):
+        try:
+            book_ids = list(dict.fromkeys(
+                int(value)
+                for value in request.query_params.get("ids", "").split(",")
+                if value
+            ))
+        except ValueError:
+            raise ValidationError(
+                {"ids": "A comma-separated list of integers is required."}
+            )
+
+        if len(book_ids) > MULTI_GET_MAX_IDS:
+            raise ValidationError(
+                {"ids": f"At most {MULTI_GET_MAX_IDS} ids are allowed."}
+            )
+
+        books = self.get_queryset().in_bulk(book_ids)
+
+        serializer = self.get_serializer(
+            [books[book_id] for book_id in book_ids if book_id in books],
+            many=True,
+        )
+        return Response(serializer.data)
+
+    @action(
+        methods=["get"],
+        detail=False,
+        url_path="typeahead",
+        url_name="typeahead",
+    )
+    def typeahead(self, request, *args, **kwargs):
+        limit = self._get_limit_param(
+            "limit", TYPEAHEAD_TOP_K, TYPEAHEAD_TOP_K
+        )
+        return Response(suggest(request.query_params.get("q", ""), limit))
+
+    @action(
+        methods=["get"],
+        detail=True,
+        url_path="search-text",
+        url_name="search-text",
+    )
+    def search_text(self, request, pk=None):
+        book = self.get_object()
+        limit = self._get_limit_param(
+            "limit", TEXT_SEARCH_LIMIT, TEXT_SEARCH_MAX_LIMIT
+        )
+
+        return Response(
+            search_book_text(book.id, request.query_params.get("q", ""), limit)
+        )
+
+    @action(
+        methods=["get"],
+        detail=True,
+        url_path="chapters",
+        url_name="chapters",
+    )
+    def table_of_contents(self, request, pk=None):
+        try:
+            toc = get_book_toc(int(pk))
+        except ValueError:
+            raise NotFound()
+
+        if toc is None:
+            raise NotFound()
+
+        limit = self._get_limit_param(
+            "limit", TOC_PAGE_SIZE, TOC_MAX_PAGE_SIZE
+        )
+        after = self._get_int_param("after") or 0
+
+        return Response(slice_toc(toc, after=after, limit=limit))
+
+    @action(
+        methods=["get"],
+        detail=True,
+        url_path="monthly-views",
+        url_name="monthly-views",
+    )
+    def monthly_views(self, request, pk=None):
+        months = self._get_limit_param(
+            "months", MONTHLY_VIEWS_LIMIT, MONTHLY_VIEWS_MAX_LIMIT
+        )
+
+        stats = models.BookMonthlyStats.objects.filter(
+            book=self.get_object()
+        )[:months]
+
+        serializer = self.get_serializer(stats, many=True)
+        return Response(serializer.data)
 
     @action(
         methods=["post"],
@@ -114,14 +352,15 @@ class BookViewSet(
         book = self.get_object()
         user = self.request.user
 
-        library = user.library.all()
+        with transaction.atomic():
+            entry, created = user.library_entries.get_or_create(book=book)
+
+            if created:
+                return Response({"status": "Book was added"})
 
-        if book in library:
-            user.library.remove(book)
-            return Response({"status": "Book was removed"})
+            entry.delete()
 
-        user.library.add(book)
-        return Response({"status": "Book was added"})
+        return Response({"status": "Book was removed"})
 
     @action(
             methods=["post"],
@@ -133,55 +372,206 @@ class BookViewSet(
         book = self.get_object()
         user = self.request.user
 
-        like, created = models.BookLike.objects.get_or_create(
-            book=book,
-            user=user
-        )
+        with transaction.atomic():
+            like, created = models.BookLike.objects.get_or_create(
+                book=book,
+                user=user
+            )
 
-        if created:
-            return Response({"status": "Like was added"})
+            if created:
+                counters.increment_counter(book.id, "likes_count")
+                return Response({"status": "Like was added"})
 
-        like.delete()
+            deleted, _ = like.delete()
+            if deleted:
+                counters.increment_counter(book.id, "likes_count", -1)
 
         return Response({"status": "Like was removed"})
 
+    def _apply_batch(self, model, counter=None):
+        serializer = serializers.BatchStateSerializer(data=self.request.data)
+        serializer.is_valid(raise_exception=True)
+
+        items = serializer.validated_data["items"]
+        statuses = apply_desired_states(
+            model,
+            self.request.user,
+            {item["book_id"]: item["desired_state"] for item in items},
+            counter=counter,
+        )
+
+        return Response({
+            "results": [
+                {
+                    "book_id": item["book_id"],
+                    "desired_state": item["desired_state"],
+                    "status": statuses[item["book_id"]],
+                }
+                for item in items
+            ]
+        })
+
+    @action(
+        methods=["post"],
+        detail=False,
+        url_path="batch-like",
+        url_name="batch-like",
+    )
+    def batch_like(self, request, *args, **kwargs):
+        return self._apply_batch(models.BookLike, counter="likes_count")
+
+    @action(
+        methods=["post"],
+        detail=False,
+        url_path="batch-library",
+        url_name="batch-library",
+    )
+    def batch_library(self, request, *args, **kwargs):
+        return self._apply_batch(models.Book.users.through)
+
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
         user = self.request.user
-
-        models.BookView.objects.get_or_create(
-            book=instance,
-            user=user
+        state = generics.get_object_or_404(
+            annotate_user_state(
+                models.Book.objects.only(
+                    "id",
+                    "updated_at",
+                    "views_count",
+                    "likes_count",
+                    "month_views_count",
+                ),
+                user,
+                ("is_liked", "in_library"),
+            ),
+            pk=kwargs["pk"],
         )
-        models.BookMonthView.objects.get_or_create(
-            book=instance,
-            user=user
+
+        tracking.record_view(state, user)
+
+        # Counters and the user's flags are not part of updated_at.
+        etag = make_etag(
+            state.id,
+            state.updated_at,
+            state.views_count,
+            state.likes_count,
+            state.is_liked,
+            state.in_library,
+            *representation_key(request),
         )
+        response = check_not_modified(request, etag)
 
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        if response is None:
+            instance = self.get_object()
+            instance.viewed = True
 
+            serializer = self.get_serializer(instance)
+            response = Response(serializer.data)
 
-class UserLibraryView(generics.ListAPIView):
+        return set_validators(response, etag)
+
+
+class UserLibraryView(
+    SparseFieldsViewMixin,
+    QueryPlanMixin,
+    ValuesListMixin,
+    generics.ListAPIView,
+):
     serializer_class = serializers.BookListSerializer
     permission_classes = (IsAuthenticated, )
     authentication_classes = (JWTAuthentication, )
+    pagination_class = KeysetPagination
+    cursor_orderings = {"id": "id", "added": "added_at"}
+    default_cursor_ordering = "-added"
 
     def get_queryset(self):
-        queryset = models.Book.objects.filter(
-            users=self.request.user.id
-        ).prefetch_related("genres", "authors")
+        queryset = annotate_user_state(
+            self.plan_queryset(
+                models.Book.objects.filter(
+                    library_entries__user=self.request.user.id
+                ).annotate(added_at=F("library_entries__added_at")),
+            ),
+            self.request.user,
+            self.get_field_selection(),
+        )
 
         return queryset
 
 
+class BookCommentListView(QueryPlanMixin, generics.ListAPIView):
+    serializer_class = serializers.CommentaryThreadSerializer
+    permission_classes = (IsAuthenticated, )
+    authentication_classes = (JWTAuthentication, )
+    pagination_class = CommentPagination
+    cursor_orderings = {"date": "date"}
+    default_cursor_ordering = "-date"
+
+    def get_queryset(self):
+        return self.plan_queryset(comments.book_comments(self.kwargs["pk"]))
+
+
+class CommentaryReplyListView(QueryPlanMixin, generics.ListAPIView):
+    serializer_class = serializers.ReplyBookDetailSerializer
+    permission_classes = (IsAuthenticated, )
+    authentication_classes = (JWTAuthentication, )
+    pagination_class = CommentPagination
+    cursor_orderings = {"date": "date"}
+    default_cursor_ordering = "date"
+
+    def get_queryset(self):
+        return self.plan_queryset(
+            comments.comment_replies(self.kwargs["pk"])
+        )
+
+
 class ChapterViewSet(
+    SparseFieldsViewMixin,
+    QueryPlanMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet,
 ):
-    queryset = models.Chapter.objects.select_related("book")
+    queryset = models.Chapter.objects.all()
     serializer_class = serializers.ChapterDetailSerializer
 
+    def get_queryset(self):
+        queryset = self.plan_queryset(self.queryset)
+
+        if "related_chapters" in self.get_field_selection():
+            queryset = queryset.annotate(
+                previous_chapter_id=Subquery(
+                    models.Chapter.objects.filter(
+                        book=OuterRef("book"),
+                        serial_number__lt=OuterRef("serial_number"),
+                    ).order_by("-serial_number").values("id")[:1]
+                ),
+                next_chapter_id=Subquery(
+                    models.Chapter.objects.filter(
+                        book=OuterRef("book"),
+                        serial_number__gt=OuterRef("serial_number"),
+                    ).order_by("serial_number").values("id")[:1]
+                ),
+            )
+
+        return queryset
+
+
+class CatalogSyncView(generics.GenericAPIView):
+    """
+    Genres, authors, books and chapters changed after the ``since``
+    cursor. Clients store ``next_cursor`` and call again while
+    ``has_more`` is true; ``since=0`` returns the whole catalog.
+    """
+    permission_classes = (IsAuthenticated, )
+
+    def get(self, request, *args, **kwargs):
+        since = get_int_param(request, "since", default=0, minimum=0)
+        limit = get_limit_param(
+            request, "limit", SYNC_PAGE_SIZE, SYNC_MAX_PAGE_SIZE
+        )
+
+        return Response(
+            get_changes(since, limit, self.get_serializer_context())
+        )
+
 
 class CommentaryCreateView(generics.GenericAPIView):
     serializer_class = serializers.CommentaryCreateSerializer
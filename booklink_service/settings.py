@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import importlib.util
 import os
 
 from datetime import timedelta
@@ -98,6 +99,20 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -149,7 +164,18 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
-    )
+    ),
+    # JSON is encoded with orjson when installed; MessagePack is offered
+    # for "Accept: application/msgpack" when msgpack is installed.
+    "DEFAULT_RENDERER_CLASSES": [
+        "booklink_service.renderers.ORJSONRenderer",
+        *(
+            ["booklink_service.renderers.MessagePackRenderer"]
+            if importlib.util.find_spec("msgpack")
+            else []
+        ),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 
@@ -188,6 +214,59 @@ Q_CLUSTER = {
 }
 
 
+# Book view tracking. In "buffered" mode views are collected in a
+# deduplicating buffer and written in bulk, outside the request: the
+# "local" buffer is drained by a background thread in each process; with
+# the "redis" buffer, schedule book.task.flush_view_buffer to run every
+# flush_interval seconds.
+# "sketch" counting estimates unique viewers with HyperLogLog sketches
+# (about 1.6% standard error); view_rows=False then stops storing
+# per-user BookView rows.
+BOOK_VIEW_TRACKING = {
+    "mode": os.environ.get("BOOK_VIEW_TRACKING_MODE", "immediate"),
+    "buffer": os.environ.get("BOOK_VIEW_TRACKING_BUFFER", "local"),
+    "max_size": 1000,
+    "flush_interval": 30,
+    "counting": os.environ.get("BOOK_VIEW_COUNTING", "exact"),
+    "view_rows": os.environ.get("BOOK_VIEW_ROWS", "True") == "True",
+}
+
+# "database" ranks by the indexed Book.month_views_count column,
+# "redis" keeps per-month and per-genre sorted sets.
+BOOK_LEADERBOARD_BACKEND = os.environ.get(
+    "BOOK_LEADERBOARD_BACKEND", "database"
+)
+
+# Full-text catalog search. SQLiteFTSBackend needs the FTS5 table created
+# by the book migrations; DatabaseSearchBackend works on any database.
+BOOK_SEARCH_BACKEND = os.environ.get(
+    "BOOK_SEARCH_BACKEND", "book.search.SQLiteFTSBackend"
+)
+
+# Batched maintenance jobs (book.maintenance) run on the "long" cluster.
+# Schedule book.task.compact_change_log to keep the sync/ change log
+# down to the newest entry per object.
+BOOK_MAINTENANCE = {
+    "batch_size": 5000,
+    "sleep": 0.1,
+    "cluster": "long",
+}
+
+# Exponentially decayed trending scores, recomputed by
+# book.task.update_trending_scores.
+BOOK_TRENDING = {
+    "half_life_hours": 72,
+    "window_days": 30,
+    "view_weight": 1.0,
+    "like_weight": 3.0,
+}
+
+# List endpoints serialize .values() rows through
+# book.values_serializer instead of building model instances.
+BOOK_VALUES_SERIALIZATION = (
+    os.environ.get("BOOK_VALUES_SERIALIZATION", "True") == "True"
+)
+
 # AWS
 AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
@@ -1,7 +1,14 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
-from user.models import User
+from user.models import LibraryEntry, User
+
+
+class LibraryEntryInline(admin.TabularInline):
+    model = LibraryEntry
+    extra = 0
+    raw_id_fields = ("book", )
+    readonly_fields = ("added_at", )
 
 
 @admin.register(User)
@@ -22,7 +29,6 @@ class UserAdmin(DjangoUserAdmin):
             }
         ),
         ("Imporrtant dates", {"fields": ("last_login", "date_joined")}),
-        ("Related books", {"fields": ("library", )}),
     )
     add_fieldsets = (
         (
@@ -33,6 +39,7 @@ class UserAdmin(DjangoUserAdmin):
             }
         )
     )
+    inlines = (LibraryEntryInline, )
     list_display = ("email", "first_name", "last_name", "is_staff")
     search_fields = ("email", "first_name", "last_name")
     ordering = ("email", )
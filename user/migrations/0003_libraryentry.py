@@ -0,0 +1,83 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:31
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("book", "0019_chapter_text_index"),
+        ("user", "0002_user_library"),
+    ]
+
+    operations = [
+        # The implicit through table already has these columns and the
+        # (user, book) unique index, so only the state changes here.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="LibraryEntry",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "book",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="library_entries",
+                                to="book.book",
+                            ),
+                        ),
+                        (
+                            "user",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="library_entries",
+                                to=settings.AUTH_USER_MODEL,
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "user_user_library",
+                        "unique_together": {("user", "book")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="user",
+                    name="library",
+                    field=models.ManyToManyField(
+                        related_name="users",
+                        through="user.LibraryEntry",
+                        to="book.book",
+                    ),
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.AddField(
+            model_name="libraryentry",
+            name="added_at",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                default=django.utils.timezone.now,
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="libraryentry",
+            index=models.Index(
+                fields=["user", "added_at"],
+                name="library_user_added_idx",
+            ),
+        ),
+    ]
@@ -36,7 +36,11 @@ class UserManager(BaseUserManager):
 
 
 class User(AbstractUser):
-    library = models.ManyToManyField(Book, related_name="users")
+    library = models.ManyToManyField(
+        Book,
+        through="LibraryEntry",
+        related_name="users",
+    )
 
     username = None
     email = models.EmailField("email address", unique=True)
@@ -48,3 +52,27 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.first_name + " " + self.last_name
+
+
+class LibraryEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="library_entries",
+    )
+    book = models.ForeignKey(
+        Book,
+        on_delete=models.CASCADE,
+        related_name="library_entries",
+    )
+    added_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "user_user_library"
+        unique_together = (("user", "book"), )
+        indexes = [
+            models.Index(
+                fields=("user", "added_at"),
+                name="library_user_added_idx",
+            ),
+        ]